@@ -57,7 +57,7 @@ def build_user_message(
                 msg += f"- `{tool}`: Error - {r['error']}\n"
             else:
                 data = r.get("result", {}).get("data")
-                if data is None or data == [] or data == {}:
+                if not data:
                     msg += f"- `{tool}`: No results found\n"
                 else:
                     msg += f"- `{tool}`: {json.dumps(data, indent=2, default=str)[:500]}\n"
@@ -227,7 +227,7 @@ async def run(user_query: str,
     tools = Tools(user_name, store, ent_resolver, redis_client, active_topics)
 
     if hot_topics:
-        context.hot_topic_context = tools.get_hot_topic_context(hot_topics)
+        context.hot_topic_context = await tools.get_hot_topic_context(hot_topics)
     
     last_result = None
     terminal_states = {machine.complete, machine.clarify}
@@ -387,7 +387,7 @@ async def run(user_query: str,
     
     logger.info(f"[STELLA] Trace {trace.trace_id} completed: {len(trace.entries)} steps")
     for entry in trace.entries:
-        logger.debug(f"[STELLA] Step {entry.step}: {entry.tool} -> {entry.result_summary} ({entry.duration_ms:.0f}ms)")
+        logger.debug("[STELLA] Step {}: {} -> {} ({:.0f}ms)", entry.step, entry.tool, entry.result_summary, entry.duration_ms)
 
     return CompleteResult(
         status="complete",
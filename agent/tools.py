@@ -3,7 +3,6 @@ from typing import List, Dict, Optional, TYPE_CHECKING
 
 import faiss
 import numpy as np
-from rapidfuzz import process as fuzzy_process, fuzz
 import redis
 from main.entity_resolve import EntityResolver
 from db.memgraph import MemGraphStore
@@ -21,46 +20,42 @@ class Tools:
     
     def _resolve_entity_name(self, entity: str) -> Optional[str]:
         """Resolve user input to canonical entity name via exact or fuzzy match."""
-        
-        
-        entity_id = self.resolver.get_id(entity)
-        if entity_id:
-            profile = self.resolver.entity_profiles.get(entity_id)
-            return profile["canonical_name"] if profile else entity
-        
-        if not self.resolver._name_to_id:
-            return None
-        
-        result = fuzzy_process.extractOne(
-            query=entity,
-            choices=self.resolver._name_to_id.keys(),
-            scorer=fuzz.WRatio,
-            score_cutoff=85
-        )
-        
-        if result:
-            matched_name, _, _ = result
-            entity_id = self.resolver._name_to_id[matched_name]
+        return self._resolve_entity_names([entity])[0]
+    
+    def _resolve_entity_names(self, entities: List[str]) -> List[Optional[str]]:
+        """Resolve several inputs at once through the resolver's batched exact + fuzzy pass."""
+        resolved = []
+        for entity, entity_id in zip(entities, self.resolver.batch_resolve(entities)):
+            if entity_id is None:
+                resolved.append(None)
+                continue
             profile = self.resolver.entity_profiles.get(entity_id)
-            return profile["canonical_name"] if profile else matched_name
-        
-        return None
+            resolved.append(profile["canonical_name"] if profile else entity)
+        return resolved
     
-    async def _hydrate_evidence(self, evidence_ids: list[str]) -> list[dict]:
-        if not evidence_ids:
-            return []
+    async def _fetch_messages(self, msg_ids: list[str]) -> dict[str, dict]:
+        """Fetch message payloads for many ids with a single HMGET."""
+        if not msg_ids:
+            return {}
         content_key = f"message_content:{self.user_name}"
-        results = []
-        for msg_id in evidence_ids:
-            raw = await self.redis.hget(content_key, msg_id)
+        raws = await self.redis.hmget(content_key, msg_ids)
+        messages = {}
+        for msg_id, raw in zip(msg_ids, raws):
             if raw:
                 data = json.loads(raw)
-                results.append({
+                messages[msg_id] = {
                     "id": msg_id,
                     "message": data["message"],
                     "timestamp": data["timestamp"]
-                })
-        return results
+                }
+        return messages
+
+    async def _hydrate_evidence(self, rows: list[dict], id_lists: list[list[str]]) -> list[dict]:
+        """Attach message payloads for each row's evidence ids, one HMGET for all rows."""
+        messages = await self._fetch_messages(list({mid for ids in id_lists for mid in ids}))
+        for row, ids in zip(rows, id_lists):
+            row["evidence"] = [messages[mid] for mid in ids if mid in messages]
+        return rows
 
     
     async def search_messages(self, query: str, limit: int = 5) -> List[Dict]:
@@ -76,14 +71,11 @@ class Tools:
         Returns: List of messages with content, timestamp, and relevance score.
         """
         results = self.resolver.search_messages(query, limit)
-        content_key = f"message_content:{self.user_name}"
-        output = []
-        for msg_id, score in results:
-            raw = await self.redis.hget(content_key, msg_id)
-            if raw:
-                data = json.loads(raw)
-                output.append({"id": msg_id, "message": data["message"], "timestamp": data["timestamp"], "score": score})
-        return output
+        messages = await self._fetch_messages([msg_id for msg_id, _ in results])
+        return [
+            {**messages[msg_id], "score": score}
+            for msg_id, score in results if msg_id in messages
+        ]
 
     async def search_entities(self, query: str, limit: int = 5) -> List[Dict]:
         """
@@ -110,17 +102,15 @@ class Tools:
         Returns: Full profile with summary, type, aliases, topic, last_mentioned.
         Returns None if entity not found.
         """
-        canonical = self._resolve_entity_name(entity_name)
-        if not canonical:
+        entity_id = self.resolver.batch_resolve([entity_name])[0]
+        if entity_id is None:
             return None
         
-        entity_id = self.resolver.get_id(canonical)
-        if entity_id:
-            profile = self.resolver.entity_profiles.get(entity_id)
-            if profile:
-                return profile
+        profile = self.resolver.entity_profiles.get(entity_id)
+        if profile:
+            return profile
             
-        return self.store.get_entity_profile(canonical)
+        return self.store.get_entity_profile(entity_name)
 
     async def get_connections(self, entity_name: str, active_only: bool = True) -> List[Dict]:
         """
@@ -136,12 +126,9 @@ class Tools:
         canonical = self._resolve_entity_name(entity_name)
         if not canonical:
             return []
-        results = self.store.get_related_entities([canonical], active_only) or []
+        results, evidence_ids = self.store.get_related_entities([canonical], active_only)
         
-        for r in results:
-            r["evidence"] = await self._hydrate_evidence(r.pop("evidence_ids", []))
-        
-        return results
+        return await self._hydrate_evidence(results, evidence_ids)
 
     async def get_recent_activity(self, entity_name: str, hours: int = 24) -> List[Dict]:
         """
@@ -157,12 +144,9 @@ class Tools:
         canonical = self._resolve_entity_name(entity_name)
         if not canonical:
             return []
-        results = self.store.get_recent_activity(canonical, hours) or []
-        
-        for r in results:
-            r["evidence"] = await self._hydrate_evidence(r.pop("evidence_ids", []))
+        results, evidence_ids = self.store.get_recent_activity(canonical, hours)
         
-        return results
+        return await self._hydrate_evidence(results, evidence_ids)
 
     async def find_path(self, entity_a: str, entity_b: str) -> List[Dict]:
         """
@@ -179,16 +163,14 @@ class Tools:
             If path exists only through inactive topics: [{"hidden": True, "message": "..."}]
             Empty list if no connection found.
         """
-        canonical_a = self._resolve_entity_name(entity_a)
-        canonical_b = self._resolve_entity_name(entity_b)
+        canonical_a, canonical_b = self._resolve_entity_names([entity_a, entity_b])
         if not canonical_a or not canonical_b:
             return []
 
         path = self.store._find_path_filtered(canonical_a, canonical_b, active_only=True)
         if path:
-            for step in path:
-                step["evidence"] = await self._hydrate_evidence(step.pop("evidence_refs", []))
-            return path
+            evidence_refs = [step.pop("evidence_refs") or [] for step in path]
+            return await self._hydrate_evidence(path, evidence_refs)
 
         full_path = self.store._find_path_filtered(canonical_a, canonical_b, active_only=False)
         if full_path:
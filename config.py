@@ -3,7 +3,7 @@ import json
 import secrets
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import httpx
 from loguru import logger
 from dotenv import load_dotenv
@@ -18,6 +18,9 @@ DEFAULT_REASONING_MODEL = "google/gemini-3-flash-preview"
 DEFAULT_AGENT_MODEL = "anthropic/claude-sonnet-4.5"
 DEFAULT_TOPICS = ["General"]
 
+_http_client: Optional[httpx.AsyncClient] = None
+_config_cache: Optional[Tuple[int, dict]] = None
+
 
 def generate_password(length: int = 32) -> str:
     return secrets.token_urlsafe(length)[:length]
@@ -41,17 +44,30 @@ def get_default_config() -> dict:
 
 
 def load_config() -> Optional[dict]:
-    if not CONFIG_FILE.exists():
+    """Parsed config, re-read only when the file's mtime changes."""
+    global _config_cache
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        _config_cache = None
         return None
+    
+    if _config_cache is not None and _config_cache[0] == mtime:
+        return dict(_config_cache[1])
+    
     try:
         with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
+            config = json.load(f)
     except (json.JSONDecodeError, IOError) as e:
         logger.error(f"Failed to load config: {e}")
         return None
+    
+    _config_cache = (mtime, config)
+    return dict(config)
 
 
 def save_config(data: dict) -> bool:
+    global _config_cache
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         
@@ -63,6 +79,7 @@ def save_config(data: dict) -> bool:
         
         with open(CONFIG_FILE, "w") as f:
             json.dump(existing, f, indent=2)
+        _config_cache = None
         
         logger.info(f"Config saved to {CONFIG_FILE}")
         return True
@@ -83,24 +100,41 @@ def is_configured() -> bool:
     )
 
 
+def _get_http_client() -> httpx.AsyncClient:
+    """Shared client so repeated key checks reuse the pooled TLS connection."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=4)
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def validate_openrouter_key(api_key: str) -> tuple[bool, str]:
     if not api_key or not api_key.strip():
         return False, "API key is required"
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                "https://openrouter.ai/api/v1/models",
-                headers={"Authorization": f"Bearer {api_key}"}
-            )
+        response = await _get_http_client().get(
+            "https://openrouter.ai/api/v1/models",
+            headers={"Authorization": f"Bearer {api_key}"}
+        )
+        
+        if response.status_code == 200:
+            return True, "Valid"
+        elif response.status_code == 401:
+            return False, "Invalid API key"
+        else:
+            return False, f"OpenRouter returned {response.status_code}"
             
-            if response.status_code == 200:
-                return True, "Valid"
-            elif response.status_code == 401:
-                return False, "Invalid API key"
-            else:
-                return False, f"OpenRouter returned {response.status_code}"
-                
     except httpx.TimeoutException:
         return False, "OpenRouter request timed out"
     except httpx.RequestError as e:
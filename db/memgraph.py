@@ -1,7 +1,10 @@
+import queue
+import threading
 import time
+from collections import OrderedDict
 from loguru import logger
-from typing import Dict, List
-from neo4j import GraphDatabase, ManagedTransaction
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from neo4j import READ_ACCESS, GraphDatabase, ManagedTransaction, Record
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -11,116 +14,378 @@ MEMGRAPH_PASSWORD=os.environ.get("MEMGRAPH_PASSWORD")
 MEMGRAPH_HOST=os.environ.get("MEMGRAPH_HOST")
 MEMGRAPH_PORT=os.environ.get("MEMGRAPH_PORT")
 
+WRITE_CHUNK_SIZE = 1000
+HYDRATION_FETCH_SIZE = 1000
+PROFILE_CACHE_SIZE = 10_000
+PROFILE_CACHE_TTL = 60
+HOT_TOPIC_CACHE_SIZE = 32
+HOT_TOPIC_CACHE_TTL = 60
+MOOD_FLUSH_INTERVAL = 2.0
+MOOD_MAX_RETRIES = 5
+
+
+def _now_us() -> int:
+    """Epoch microseconds, the same unit Memgraph's timestamp() returns."""
+    return time.time_ns() // 1000
+
+
 class MemGraphStore:
+
+    _SCHEMA_CONSTRAINTS = [
+        ("Entity", "id"),
+        ("Topic", "name"),
+    ]
+
+    _SCHEMA_INDEXES = [
+        ("MoodCheckpoint", ("timestamp",)),
+        ("Entity", ("canonical_name",)),
+        ("Entity", ("canonical_name", "last_mentioned")),
+    ]
+
+    _SCHEMA_EDGE_INDEXES = [
+        ("RELATED_TO", "last_seen"),
+    ]
+
+    # Large write statements live at class scope so each call sends byte-identical text
+
+    # Entities and relationships in one statement; count(*) collapses the entity
+    # rows to a single row so the relationship UNWIND runs even with no entities
+    _Q_WRITE_BATCH = """
+        UNWIND $entities AS ent
+        MERGE (e:Entity {id: ent.id})
+        ON CREATE SET
+            e.canonical_name = ent.canonical_name,
+            e.aliases = ent.aliases,
+            e.type = ent.type,
+            e.summary = ent.summary,
+            e.confidence = ent.confidence,
+            e.last_updated = $now,
+            e.last_mentioned = $now,
+            e.embedding = ent.embedding
+        ON MATCH SET 
+            e.canonical_name = ent.canonical_name,
+            e.confidence = ent.confidence,
+            e.last_updated = $now,
+            e.last_mentioned = $now
+
+        SET e.aliases = reduce(acc = [], alias IN coalesce(e.aliases, []) + ent.aliases |
+            CASE WHEN alias IN acc THEN acc ELSE acc + [alias] END)
+
+        WITH e, ent
+        FOREACH (_ IN CASE WHEN ent.topic IS NOT NULL AND ent.topic <> "" THEN [1] ELSE [] END |
+            MERGE (t:Topic {name: ent.topic})
+            MERGE (e)-[:BELONGS_TO]->(t)
+        )
+
+        WITH count(*) AS _
+        UNWIND $relationships AS rel
+        MATCH (a:Entity {id: rel.id_a})
+        MATCH (b:Entity {id: rel.id_b})
+        MERGE (a)-[r:RELATED_TO]-(b)
+
+        ON CREATE SET 
+            r.weight = 1, 
+            r.confidence = rel.confidence,
+            r.last_seen = $now, 
+            r.message_ids = [rel.message_id]
+
+        ON MATCH SET 
+            r.weight = r.weight + 1,
+            r.confidence = CASE WHEN rel.confidence > r.confidence THEN rel.confidence ELSE r.confidence END,
+            r.last_seen = $now
+
+        SET r.message_ids = CASE
+            WHEN rel.message_id IN coalesce(r.message_ids, []) THEN r.message_ids
+            ELSE coalesce(r.message_ids, []) + [rel.message_id]
+        END
+    """
+
+    _Q_UPDATE_PROFILES = """
+        UNWIND $updates AS u
+        MERGE (e:Entity {id: u.id})
+
+        ON CREATE SET
+            e.canonical_name = u.canonical_name,
+            e.summary = u.summary,
+            e.embedding = u.embedding,
+            e.last_profiled_msg_id = u.last_msg_id,
+            e.last_updated = $now,
+            e.created_by = 'profile_stream'
+
+        ON MATCH SET
+            e.canonical_name = u.canonical_name,
+            e.summary = u.summary,
+            e.embedding = u.embedding,
+            e.last_updated = $now,
+            e.last_profiled_msg_id = u.last_msg_id
+
+        WITH e, u
+        FOREACH (_ IN CASE WHEN u.topic IS NOT NULL AND u.topic <> "" THEN [1] ELSE [] END |
+            MERGE (t:Topic {name: u.topic})
+            MERGE (e)-[:BELONGS_TO]->(t)
+        )
+    """
+
+    # Edges move inside a CALL subquery so each merge stays a single row; the
+    # count(*) aggregate keeps that row even when the secondary has no edges
+    _Q_MERGE_ENTITIES = """
+        UNWIND $merges AS m
+        MATCH (p:Entity {id: m.primary_id})
+        MATCH (s:Entity {id: m.secondary_id})
+        WHERE p <> s
+
+        SET p.aliases = reduce(acc = [], alias IN coalesce(p.aliases, []) + coalesce(s.aliases, []) + [s.canonical_name] |
+                CASE WHEN alias IN acc THEN acc ELSE acc + [alias] END),
+            p.summary = m.summary,
+            p.confidence = CASE WHEN coalesce(s.confidence, 0) > coalesce(p.confidence, 0) THEN s.confidence ELSE p.confidence END,
+            p.last_mentioned = CASE WHEN coalesce(s.last_mentioned, 0) > coalesce(p.last_mentioned, 0) THEN s.last_mentioned ELSE p.last_mentioned END,
+            p.last_updated = $now
+
+        WITH p, s
+
+        CALL {
+            WITH p, s
+            MATCH (s)-[r_source:RELATED_TO]-(target:Entity)
+            WHERE target <> p
+
+            MERGE (p)-[r_target:RELATED_TO]-(target)
+            ON CREATE SET 
+                r_target.weight = r_source.weight,
+                r_target.confidence = r_source.confidence,
+                r_target.last_seen = r_source.last_seen
+            ON MATCH SET
+                r_target.weight = r_target.weight + r_source.weight,
+                r_target.confidence = CASE WHEN r_source.confidence > r_target.confidence THEN r_source.confidence ELSE r_target.confidence END,
+                r_target.last_seen = CASE WHEN r_source.last_seen > r_target.last_seen THEN r_source.last_seen ELSE r_target.last_seen END
+
+            SET r_target.message_ids = reduce(acc = [], mid IN coalesce(r_target.message_ids, []) + coalesce(r_source.message_ids, []) |
+                CASE WHEN mid IN acc THEN acc ELSE acc + [mid] END)
+
+            RETURN count(*) AS moved_edges
+        }
+
+        WITH s, s.id AS secondary_id
+        DETACH DELETE s
+        RETURN collect(secondary_id) AS merged
+    """
+
+    _Q_LOG_MOODS = """
+        UNWIND $moods AS mood
+        MATCH (u:Entity {canonical_name: mood.user_name, type: 'person'})
+        CREATE (m:MoodCheckpoint {
+            timestamp: mood.timestamp,
+            primary_emotion: mood.primary,
+            primary_count: mood.primary_count,
+            secondary_emotion: mood.secondary,
+            secondary_count: mood.secondary_count,
+            message_count: mood.message_count
+        })
+        MERGE (u)-[:FELT]->(m)
+    """
+
+    # active_only is fixed per call, so each variant is its own statement
+    # rather than a per-row ($active_only = false) OR ... branch
+    _Q_RELATED = """
+        MATCH (source:Entity) WHERE source.canonical_name IN $names
+        MATCH (source)-[r:RELATED_TO]-(target:Entity)
+        {active_filter}
+        RETURN
+            source.canonical_name as source,
+            target.canonical_name as target,
+            target.summary as target_summary,
+            r.weight as connection_strength,
+            r.message_ids as evidence_ids,
+            r.confidence as confidence,
+            r.last_seen as last_seen
+        ORDER BY r.weight DESC, r.last_seen DESC
+        LIMIT 50
+    """
+    _Q_RELATED_ACTIVE = _Q_RELATED.format(active_filter="""WHERE NOT EXISTS((target)-[:BELONGS_TO]->(:Topic {status: 'inactive'}))""")
+    _Q_RELATED_ALL = _Q_RELATED.format(active_filter="")
+
+    # The active variant resolves the hidden entity ids once up front, so the
+    # path filter is a list lookup per node rather than a pattern match
+    _Q_PATH = """
+        {hidden_prelude}
+        MATCH (start:Entity {{canonical_name: $start_name}})
+        MATCH (end:Entity {{canonical_name: $end_name}})
+        MATCH p = shortestPath((start)-[:RELATED_TO*..4]-(end))
+        {active_filter}
+        RETURN [n in nodes(p) | n.canonical_name] as names,
+            [r in relationships(p) | r.message_ids] as evidence_ids
+    """
+    _Q_PATH_ACTIVE = _Q_PATH.format(
+        hidden_prelude="""OPTIONAL MATCH (x:Entity)-[:BELONGS_TO]->(:Topic {status: 'inactive'})
+        WITH collect(DISTINCT x.id) AS hidden""",
+        active_filter="WHERE NONE(n IN nodes(p) WHERE n.id IN hidden)"
+    )
+    _Q_PATH_ALL = _Q_PATH.format(hidden_prelude="", active_filter="")
+
+    _Q_ENTITY_EXISTS = """
+        MATCH (e:Entity {canonical_name: $name})
+        RETURN e.id AS id
+        LIMIT 1
+    """
+    _Q_VISIBLE_ENTITY = """
+        MATCH (e:Entity {canonical_name: $name})
+        WHERE NOT EXISTS((e)-[:BELONGS_TO]->(:Topic {status: 'inactive'}))
+        RETURN e.id AS id
+        LIMIT 1
+    """
+
     def __init__(self, uri: str = None):
         if uri is None:
             uri = f"bolt://{MEMGRAPH_HOST}:{MEMGRAPH_PORT}"
         self.driver = GraphDatabase.driver(
             uri,
-            auth=(MEMGRAPH_USER, MEMGRAPH_PASSWORD)
+            auth=(MEMGRAPH_USER, MEMGRAPH_PASSWORD),
+            max_connection_pool_size=32,
+            connection_acquisition_timeout=30,
+            max_connection_lifetime=3600,
+            keep_alive=True
         )
+        self._profile_cache: OrderedDict[str, Tuple[float, Optional[Dict]]] = OrderedDict()
+        self._profile_cache_names: Dict[int, set[str]] = {}
+        self._profile_cache_lock = threading.Lock()
+        self._hot_topic_cache: OrderedDict[Tuple[str, ...], Tuple[float, Dict[str, List[Dict]]]] = OrderedDict()
+        self._hot_topic_cache_lock = threading.Lock()
         self.verify_conn()
         self._setup_schema()
+
+        # Mood checkpoints are off the caller's path: queued, then written in batches
+        self._mood_queue: queue.Queue = queue.Queue()
+        self._mood_retry: List[Dict] = []
+        self._mood_failures = 0
+        self._mood_stop = threading.Event()
+        self._mood_thread = threading.Thread(target=self._mood_writer, name="mood-writer", daemon=True)
+        self._mood_thread.start()
         logger.info("Graph store initialized")
 
     def close(self):
+        self._mood_stop.set()
+        self._mood_thread.join()
         if self.driver:
             self.driver.close()
     
     def verify_conn(self):
         self.driver.verify_connectivity()
     
+    def invalidate_profiles(self, names: Optional[Iterable[str]] = None, entity_ids: Optional[Iterable[int]] = None):
+        """
+        Drop cached get_entity_profile results by canonical name and/or entity id
+        (the id form also catches an entity cached under a name it no longer has).
+        Clears everything when neither is given.
+        """
+        with self._profile_cache_lock:
+            if names is None and entity_ids is None:
+                self._profile_cache.clear()
+                self._profile_cache_names.clear()
+                return
+            stale = set(names or ())
+            for entity_id in entity_ids or ():
+                stale |= self._profile_cache_names.get(entity_id, set())
+            for name in stale:
+                self._evict_profile(name)
+    
+    def _evict_profile(self, name: str):
+        """Caller holds _profile_cache_lock."""
+        entry = self._profile_cache.pop(name, None)
+        if entry and entry[1]:
+            cached_names = self._profile_cache_names.get(entry[1]["id"])
+            if cached_names is not None:
+                cached_names.discard(name)
+                if not cached_names:
+                    del self._profile_cache_names[entry[1]["id"]]
+    
+    def _read(self, query: str, params: Dict = None) -> List[Record]:
+        """Run a read-only query as a managed read transaction (retried on transient errors)."""
+        def _run(tx: 'ManagedTransaction') -> List[Record]:
+            return list(tx.run(query, params or {}))
+
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            return session.execute_read(_run)
+    
     def get_max_entity_id(self) -> int:
         """
         Returns the highest entity ID currently in the graph.
         Used on startup to sync Redis counters.
         """
         query = "MATCH (e:Entity) RETURN max(e.id) as max_id"
-        with self.driver.session() as session:
-            result = session.run(query).single()
-            return result["max_id"] if result and result["max_id"] is not None else 0
+        records = self._read(query)
+        max_id = records[0]["max_id"] if records else None
+        return max_id if max_id is not None else 0
     
     def _setup_schema(self):
         """
         Create indices and constraints to ensure performance and data integrity.
+        Existing schema is read once up front so only missing objects are created.
         """
-        queries = [
-            "CREATE CONSTRAINT ON (e:Entity) ASSERT e.id IS UNIQUE;",
-            "CREATE CONSTRAINT ON (t:Topic) ASSERT t.name IS UNIQUE",
-            "CREATE INDEX ON :MoodCheckpoint(timestamp);"
-            "CREATE INDEX ON :Entity(canonical_name);"
-        ]
-        
+        def _props(value) -> tuple:
+            return tuple(value) if isinstance(value, (list, tuple)) else (value,)
+
+        def _run(q: str):
+            # One failing statement (e.g. DDL an older server lacks) must not abort startup
+            try:
+                session.run(q).consume()
+            except Exception as e:
+                logger.warning(f"Schema setup note: {q} -> {e}")
+
         with self.driver.session() as session:
-            for q in queries:
-                try:
-                    session.run(q)
-                except Exception as e:
-                    logger.debug(f"Schema setup note: {e}")
+            try:
+                existing_constraints = {
+                    (r["constraint type"], r["label"], _props(r["properties"]))
+                    for r in session.run("SHOW CONSTRAINT INFO")
+                }
+                existing_indexes = {
+                    (r["label"], _props(r["property"])) for r in session.run("SHOW INDEX INFO")
+                }
+            except Exception as e:
+                logger.warning(f"Could not read existing schema, creating all: {e}")
+                existing_constraints, existing_indexes = set(), set()
+
+            for label, prop in self._SCHEMA_CONSTRAINTS:
+                if ("unique", label, (prop,)) not in existing_constraints:
+                    _run(f"CREATE CONSTRAINT ON (n:{label}) ASSERT n.{prop} IS UNIQUE")
+
+            for label, props in self._SCHEMA_INDEXES:
+                if (label, props) not in existing_indexes:
+                    _run(f"CREATE INDEX ON :{label}({', '.join(props)})")
+
+            for edge_type, prop in self._SCHEMA_EDGE_INDEXES:
+                if (edge_type, (prop,)) not in existing_indexes:
+                    _run(f"CREATE EDGE INDEX ON :{edge_type}({prop})")
         logger.info("Memgraph schema indices verified.")
     
     def write_batch(self, entities: List[Dict], relationships: List[Dict], is_user_message: bool = False):
-        def _write(tx: 'ManagedTransaction'):
-            for ent in entities:
-                tx.run("""
-                    MERGE (e:Entity {id: $id})
-                    ON CREATE SET
-                        e.canonical_name = $canonical_name,
-                        e.aliases = $aliases,
-                        e.type = $type,
-                        e.summary = $summary,
-                        e.confidence = $confidence,
-                        e.last_updated = timestamp(),
-                        e.last_mentioned = timestamp(),
-                        e.embedding = $embedding
-                    ON MATCH SET 
-                        e.canonical_name = $canonical_name,
-                        e.confidence = $confidence,
-                        e.last_updated = timestamp(),
-                        e.last_mentioned = timestamp()
-
-                    WITH e
-                    UNWIND coalesce(e.aliases, []) + $aliases AS alias
-                    WITH e, collect(DISTINCT alias) AS unique_aliases
-                    SET e.aliases = unique_aliases
-
-                    WITH e
-                    FOREACH (_ IN CASE WHEN $topic IS NOT NULL AND $topic <> "" THEN [1] ELSE [] END |
-                        MERGE (t:Topic {name: $topic})
-                        MERGE (e)-[:BELONGS_TO]->(t)
-                    )
-                """, **ent, is_user_message=is_user_message)
-
-            for rel in relationships:
-                tx.run("""
-                    MATCH (a:Entity {canonical_name: $entity_a})
-                    MATCH (b:Entity {canonical_name: $entity_b})
-                    MERGE (a)-[r:RELATED_TO]-(b)
-                    
-                    ON CREATE SET 
-                        r.weight = 1, 
-                        r.confidence = $confidence,
-                        r.last_seen = timestamp(), 
-                        r.message_ids = [$message_id]
-                        
-                    ON MATCH SET 
-                        r.weight = r.weight + 1,
-                        r.confidence = CASE WHEN $confidence > r.confidence THEN $confidence ELSE r.confidence END,
-                        r.last_seen = timestamp()
-                       
-                    WITH r
-                    UNWIND coalesce(r.message_ids, []) + [$message_id] AS mid
-                    WITH r, collect(DISTINCT mid) AS unique_ids
-                    SET r.message_ids = unique_ids
-                """, **rel)
+        if not entities and not relationships:
+            return
+        
+        now = _now_us()
+
+        def _write(tx: 'ManagedTransaction', ents: List[Dict], rels: List[Dict]):
+            tx.run(self._Q_WRITE_BATCH, entities=ents, relationships=rels, is_user_message=is_user_message, now=now)
+
+        # Oversized batches commit in chunks, all entities before any relationship
+        # so every edge's endpoints already exist when it is matched
+        if len(entities) <= WRITE_CHUNK_SIZE and len(relationships) <= WRITE_CHUNK_SIZE:
+            chunks = [(entities, relationships)]
+        else:
+            chunks = [(entities[i:i + WRITE_CHUNK_SIZE], []) for i in range(0, len(entities), WRITE_CHUNK_SIZE)]
+            chunks += [([], relationships[i:i + WRITE_CHUNK_SIZE]) for i in range(0, len(relationships), WRITE_CHUNK_SIZE)]
 
         with self.driver.session() as session:
-            session.execute_write(_write)
+            for ents, rels in chunks:
+                session.execute_write(_write, ents, rels)
+        self.invalidate_profiles(
+            names=[ent["canonical_name"] for ent in entities],
+            entity_ids=[ent["id"] for ent in entities]
+        )
     
-    def get_all_entities_for_hydration(self) -> list[dict]:
+    def iter_entities_for_hydration(self, fetch_size: int = HYDRATION_FETCH_SIZE) -> Iterator[Record]:
         """
-        Fetch all entity data needed to hydrate EntityResolver.
-        Single query, single pass.
+        Stream all entity data needed to hydrate EntityResolver.
+        Single query, single pass; rows arrive fetch_size at a time so the
+        full set (with embeddings) is never held in memory at once.
         """
         query = """
         MATCH (e:Entity)
@@ -136,9 +401,8 @@ class MemGraphStore:
             e.summary AS summary,
             e.embedding AS embedding
         """
-        with self.driver.session() as session:
-            result = session.run(query)
-            return [dict(record) for record in result]
+        with self.driver.session(default_access_mode=READ_ACCESS, fetch_size=fetch_size) as session:
+            yield from session.run(query)
     
 
     def update_entity_profile(self, entity_id: int, canonical_name: str, 
@@ -148,42 +412,35 @@ class MemGraphStore:
         Update an existing entity's profile without touching relationships.
         Called by GraphBuilder when processing PROFILE_UPDATE messages.
         """
+        self.update_entity_profiles([{
+            "id": entity_id,
+            "canonical_name": canonical_name,
+            "summary": summary,
+            "embedding": embedding,
+            "last_msg_id": last_msg_id,
+            "topic": topic
+        }])
+
+    def update_entity_profiles(self, updates: List[Dict]):
+        """
+        Bulk variant of update_entity_profile: one UNWIND statement for all rows.
+        Each row needs id, canonical_name, summary, embedding, last_msg_id, topic.
+        """
+        if not updates:
+            return
+        
+        now = _now_us()
+
         def _update(tx: 'ManagedTransaction'):
-            tx.run("""
-                MERGE (e:Entity {id: $id})
-                
-                ON CREATE SET
-                    e.canonical_name = $canonical_name,
-                    e.summary = $summary,
-                    e.embedding = $embedding,
-                    e.last_profiled_msg_id = $last_msg_id,
-                    e.last_updated = timestamp(),
-                    e.created_by = 'profile_stream'
-
-                ON MATCH SET
-                    e.canonical_name = $canonical_name,
-                    e.summary = $summary,
-                    e.embedding = $embedding,
-                    e.last_updated = timestamp(),
-                    e.last_profiled_msg_id = $last_msg_id
-                
-                WITH e
-                FOREACH (_ IN CASE WHEN $topic IS NOT NULL AND $topic <> "" THEN [1] ELSE [] END |
-                    MERGE (t:Topic {name: $topic})
-                    MERGE (e)-[:BELONGS_TO]->(t)
-                )
-            """, 
-            id=entity_id, 
-            canonical_name=canonical_name, 
-            summary=summary,
-            embedding=embedding,
-            last_msg_id=last_msg_id,
-            topic=topic
-            )
+            tx.run(self._Q_UPDATE_PROFILES, updates=updates, now=now)
         
         with self.driver.session() as session:
             session.execute_write(_update)
-            logger.info(f"Updated entity {entity_id} profile (checkpoint: msg_{last_msg_id})")
+            logger.info(f"Updated {len(updates)} entity profiles")
+        self.invalidate_profiles(
+            names=[u["canonical_name"] for u in updates],
+            entity_ids=[u["id"] for u in updates]
+        )
 
     def cleanup_null_entities(self) -> int:
         """Remove entities with null type and their relationships."""
@@ -198,6 +455,7 @@ class MemGraphStore:
             record = result.single()
             deleted = record["deleted"] if record else 0
             if deleted > 0:
+                self.invalidate_profiles()
                 logger.info(f"Cleaned up {deleted} null-type entities")
             return deleted
     
@@ -206,20 +464,32 @@ class MemGraphStore:
         MATCH (a:Entity {id: $id_a})-[r:RELATED_TO]-(b:Entity {id: $id_b})
         RETURN count(r) > 0 as connected
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"id_a": id_a, "id_b": id_b}).single()
-            return result["connected"] if result else False
+        records = self._read(query, {"id_a": id_a, "id_b": id_b})
+        return records[0]["connected"] if records else False
     
     def get_neighbor_ids(self, entity_id: int) -> set[int]:
         query = """
         MATCH (e:Entity {id: $entity_id})-[:RELATED_TO]-(neighbor:Entity)
         RETURN neighbor.id as neighbor_id
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"entity_id": entity_id})
-            return {record["neighbor_id"] for record in result}
+        return {record["neighbor_id"] for record in self._read(query, {"entity_id": entity_id})}
     
-    def get_entities_by_name(self, name: str) -> List[Dict]:
+    def get_neighbor_ids_bulk(self, entity_ids: List[int]) -> Dict[int, set[int]]:
+        """get_neighbor_ids for many entities in one round trip."""
+        if not entity_ids:
+            return {}
+        query = """
+        UNWIND $entity_ids AS eid
+        MATCH (e:Entity {id: eid})
+        OPTIONAL MATCH (e)-[:RELATED_TO]-(neighbor:Entity)
+        RETURN eid, collect(DISTINCT neighbor.id) as neighbor_ids
+        """
+        adjacency = {eid: set() for eid in entity_ids}
+        for record in self._read(query, {"entity_ids": list(entity_ids)}):
+            adjacency[record["eid"]] = set(record["neighbor_ids"])
+        return adjacency
+    
+    def get_entities_by_name(self, name: str) -> List[Record]:
         query = """
         MATCH (e:Entity)
         WHERE toLower(e.canonical_name) = toLower($name)
@@ -227,9 +497,7 @@ class MemGraphStore:
         RETURN e.id as id, e.canonical_name as canonical_name, 
             e.type as type, e.aliases as aliases, e.summary as summary
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"name": name})
-            return [dict(record) for record in result]
+        return self._read(query, {"name": name})
 
     def set_topic_status(self, topic_name: str, status: str):
         """Handles Topic State (active/inactive/hot)"""
@@ -237,6 +505,10 @@ class MemGraphStore:
         query = "MERGE (t:Topic {name: $name}) SET t.status = $status"
         with self.driver.session() as session:
             session.run(query, {"name": topic_name, "status": status}).consume()
+        # Profiles of entities in an inactive topic are hidden, so any cached result may flip
+        self.invalidate_profiles()
+        with self._hot_topic_cache_lock:
+            self._hot_topic_cache.clear()
     
     def log_mood_checkpoint(
         self,
@@ -247,57 +519,93 @@ class MemGraphStore:
         secondary_count: int,
         message_count: int
     ):
-        query = """
-        MATCH (u:Entity {canonical_name: $user_name, type: 'person'})
-        CREATE (m:MoodCheckpoint {
-            timestamp: timestamp(),
-            primary_emotion: $primary,
-            primary_count: $primary_count,
-            secondary_emotion: $secondary,
-            secondary_count: $secondary_count,
-            message_count: $message_count
+        """Queue a checkpoint; the mood writer thread persists it on its next flush."""
+        self._mood_queue.put({
+            "user_name": user_name,
+            "timestamp": _now_us(),
+            "primary": primary,
+            "primary_count": primary_count,
+            "secondary": secondary,
+            "secondary_count": secondary_count,
+            "message_count": message_count
         })
-        MERGE (u)-[:FELT]->(m)
-        """
-        with self.driver.session() as session:
-            session.run(query, {
-                "user_name": user_name,
-                "primary": primary,
-                "primary_count": primary_count,
-                "secondary": secondary,
-                "secondary_count": secondary_count,
-                "message_count": message_count
-            }).consume()
     
+    def _mood_writer(self):
+        while not self._mood_stop.wait(MOOD_FLUSH_INTERVAL):
+            self._flush_moods()
+        # Shutdown: keep retrying until the queue is written or the retry budget is spent
+        while not self._flush_moods():
+            time.sleep(MOOD_FLUSH_INTERVAL)
+    
+    def _flush_moods(self) -> bool:
+        """
+        Write queued checkpoints, plus any batch carried over from a failed flush.
+        A failed batch is retried on the next flush, up to MOOD_MAX_RETRIES times.
+        Returns True when nothing is left pending. Only the writer thread calls this.
+        """
+        moods = self._mood_retry
+        while True:
+            try:
+                moods.append(self._mood_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not moods:
+            return True
+        
+        def _write(tx: 'ManagedTransaction'):
+            tx.run(self._Q_LOG_MOODS, moods=moods)
+        
+        try:
+            with self.driver.session() as session:
+                session.execute_write(_write)
+            logger.debug("Flushed {} mood checkpoints", len(moods))
+        except Exception as e:
+            self._mood_failures += 1
+            if self._mood_failures < MOOD_MAX_RETRIES:
+                logger.warning(f"Mood flush failed (attempt {self._mood_failures}/{MOOD_MAX_RETRIES}, {len(moods)} checkpoints kept for retry): {e}")
+                self._mood_retry = moods
+                return False
+            logger.error(f"Mood flush failed {MOOD_MAX_RETRIES} times, dropping {len(moods)} checkpoints: {moods}")
+        
+        self._mood_retry = []
+        self._mood_failures = 0
+        return True
     
     def get_hot_topic_context(self, hot_topic_names: List[str]):
         """
         Retrieves the top 3 most recently active entities for each Hot Topic.
-        """
+        Cached per topic set for HOT_TOPIC_CACHE_TTL; topic status changes clear it.
+        Returns fresh dicts, so callers may mutate the result.
+        """
+        key = tuple(sorted(set(hot_topic_names)))
+        with self._hot_topic_cache_lock:
+            cached = self._hot_topic_cache.get(key)
+            if cached and time.monotonic() - cached[0] < HOT_TOPIC_CACHE_TTL:
+                self._hot_topic_cache.move_to_end(key)
+                return self._copy_topic_context(cached[1])
+
         query = """
         MATCH (t:Topic) WHERE t.name IN $hot_topics
         MATCH (e:Entity)-[:BELONGS_TO]->(t)
 
         WITH t, e ORDER BY e.last_mentioned DESC 
         WITH t, collect(e)[..3] as top_entities
-        UNWIND top_entities as e
-        RETURN t.name as topic, e.canonical_name as name, e.summary as summary
+        RETURN t.name as topic, [e IN top_entities | {name: e.canonical_name, summary: e.summary}] as entities
         """
         
-        with self.driver.session() as session:
-            result = session.run(query, {"hot_topics": hot_topic_names})
-            
-            grouped = {}
-            for record in result:
-                topic = record["topic"]
-                if topic not in grouped:
-                    grouped[topic] = []
-                grouped[topic].append({
-                    "name": record["name"],
-                    "summary": record["summary"]
-                })
-            
-            return grouped
+        result = self._read(query, {"hot_topics": hot_topic_names})
+        context = {record["topic"]: record["entities"] for record in result}
+
+        with self._hot_topic_cache_lock:
+            self._hot_topic_cache[key] = (time.monotonic(), context)
+            self._hot_topic_cache.move_to_end(key)
+            if len(self._hot_topic_cache) > HOT_TOPIC_CACHE_SIZE:
+                self._hot_topic_cache.popitem(last=False)
+        return self._copy_topic_context(context)
+
+    @staticmethod
+    def _copy_topic_context(context: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        return {topic: [dict(entity) for entity in entities] for topic, entities in context.items()}
     
     def search_entity(self, query: str, limit: int = 5):
         """
@@ -314,15 +622,21 @@ class MemGraphStore:
         ORDER BY e.last_mentioned DESC
         LIMIT $limit
         """
-        with self.driver.session() as session:
-            result = session.run(query_cypher, {"query": query, "limit": limit})
-            return [record.data() for record in result]
+        result = self._read(query_cypher, {"query": query, "limit": limit})
+        return [record.data() for record in result]
     
     def get_entity_profile(self, entity_name: str):
         """
         Get the full profile for a specific entity.
+        Served from a short-lived LRU; writes touching the entity evict it.
         """
 
+        with self._profile_cache_lock:
+            cached = self._profile_cache.get(entity_name)
+            if cached and time.monotonic() - cached[0] < PROFILE_CACHE_TTL:
+                self._profile_cache.move_to_end(entity_name)
+                return dict(cached[1]) if cached[1] else None
+
         query = """
         MATCH (e:Entity {canonical_name: $name})
         OPTIONAL MATCH (e)-[:BELONGS_TO]->(t:Topic)
@@ -337,48 +651,41 @@ class MemGraphStore:
             e.last_updated as last_updated,
             t.name as topic
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"name": entity_name})
-            record = result.single()
-            return dict(record) if record else None
+        records = self._read(query, {"name": entity_name})
+        profile = dict(records[0]) if records else None
+
+        with self._profile_cache_lock:
+            self._evict_profile(entity_name)
+            self._profile_cache[entity_name] = (time.monotonic(), profile)
+            if profile:
+                self._profile_cache_names.setdefault(profile["id"], set()).add(entity_name)
+            if len(self._profile_cache) > PROFILE_CACHE_SIZE:
+                self._evict_profile(next(iter(self._profile_cache)))
+        return dict(profile) if profile else None
 
-    def get_related_entities(self, entity_names: List[str], active_only: bool = True):
+    def get_related_entities(self, entity_names: List[str], active_only: bool = True) -> Tuple[List[Dict], List[List[str]]]:
         """
         Find all entities connected to the given entities.
         Use this when the user asks about someone's connections, relationships, network, or "who/what is related to X".
         Set active_only=False if the user wants to include entities from inactive topics.
-        Returns: connected entities with connection strength and supporting message references.
+        Returns: (connected entities with connection strength, per-row supporting message ids).
         """
 
-        query = """
-        MATCH (source:Entity) WHERE source.canonical_name IN $names
-        MATCH (source)-[r:RELATED_TO]-(target:Entity)
-        OPTIONAL MATCH (target)-[:BELONGS_TO]->(t:Topic)
-        WITH source, r, target, t
-        WHERE
-            ($active_only = false) OR
-            (t IS NULL) OR
-            (t.status IS NULL) OR
-            (t.status <> 'inactive')
-        RETURN
-            source.canonical_name as source,
-            target.canonical_name as target,
-            target.summary as target_summary,
-            r.weight as connection_strength,
-            r.message_ids as evidence_ids,
-            r.confidence as confidence,
-            r.last_seen as last_seen
-        ORDER BY r.weight DESC, r.last_seen DESC
-        LIMIT 50
-        """
-        with self.driver.session() as session:
-            res = session.run(query, {"names": entity_names, "active_only": active_only})
-            return [record.data() for record in res]
+        query = self._Q_RELATED_ACTIVE if active_only else self._Q_RELATED_ALL
+        rows, evidence = [], []
+        for record in self._read(query, {"names": entity_names}):
+            rows.append(record.data(
+                "source", "target", "target_summary",
+                "connection_strength", "confidence", "last_seen"
+            ))
+            evidence.append(record["evidence_ids"] or [])
+        return rows, evidence
         
     
-    def get_recent_activity(self, entity_name: str, hours: int = 24):
+    def get_recent_activity(self, entity_name: str, hours: int = 24) -> Tuple[List[Dict], List[List[str]]]:
         """
         Get recent interactions involving an entity within a time window.
+        Returns (rows, per-row evidence message ids).
         """
         cutoff_ms = int((time.time() - (hours * 3600)) * 1000)
         query = """
@@ -387,59 +694,52 @@ class MemGraphStore:
         RETURN target.canonical_name as entity, r.message_ids as evidence_ids, r.last_seen as time
         ORDER BY r.last_seen DESC
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"name": entity_name, "cutoff": cutoff_ms})
-            return [record.data() for record in result]
+        rows, evidence = [], []
+        for record in self._read(query, {"name": entity_name, "cutoff": cutoff_ms}):
+            rows.append(record.data("entity", "time"))
+            evidence.append(record["evidence_ids"] or [])
+        return rows, evidence
     
     
     def _find_path_filtered(self, start_name: str, end_name: str, active_only: bool = True) -> List[Dict]:
-        query = """
-        MATCH (start:Entity {canonical_name: $start_name})
-        MATCH (end:Entity {canonical_name: $end_name})
-        MATCH p = shortestPath((start)-[:RELATED_TO*..4]-(end))
-        WHERE ALL(n IN nodes(p) WHERE
-            $active_only = false OR
-            NOT EXISTS((n)-[:BELONGS_TO]->(:Topic)) OR
-            NOT EXISTS((n)-[:BELONGS_TO]->(:Topic {status: 'inactive'}))
-        )
-        RETURN [n in nodes(p) | n.canonical_name] as names,
-            [r in relationships(p) | r.message_ids] as evidence_ids
-        """
-        with self.driver.session() as session:
-            result = session.run(query, {
-                "start_name": start_name, 
-                "end_name": end_name,
-                "active_only": active_only
-            })
-            record = result.single()
-            if not record:
+        if start_name == end_name:
+            # No BFS needed, but the entity must exist (and be visible when active_only)
+            query = self._Q_VISIBLE_ENTITY if active_only else self._Q_ENTITY_EXISTS
+            if not self._read(query, {"name": start_name}):
                 return []
-            
-            path_data = []
-            names = record["names"]
-            evidence = record["evidence_ids"]
-            for i in range(len(evidence)):
-                path_data.append({
-                    "step": i,
-                    "entity_a": names[i],
-                    "entity_b": names[i+1],
-                    "evidence_refs": evidence[i]
-                })
-            return path_data
+            return [{"step": 0, "entity_a": start_name, "entity_b": end_name, "evidence_refs": []}]
+        
+        query = self._Q_PATH_ACTIVE if active_only else self._Q_PATH_ALL
+        records = self._read(query, {
+            "start_name": start_name, 
+            "end_name": end_name
+        })
+        if not records:
+            return []
+        
+        path_data = []
+        names = records[0]["names"]
+        evidence = records[0]["evidence_ids"]
+        for i in range(len(evidence)):
+            path_data.append({
+                "step": i,
+                "entity_a": names[i],
+                "entity_b": names[i+1],
+                "evidence_refs": evidence[i]
+            })
+        return path_data
     
     def get_topics_by_status(self) -> dict:
         query = """
         MATCH (t:Topic)
         RETURN t.name as name, coalesce(t.status, 'active') as status
         """
-        with self.driver.session() as session:
-            result = session.run(query)
-            grouped = {"active": [], "hot": [], "inactive": []}
-            for record in result:
-                status = record["status"]
-                if status in grouped:
-                    grouped[status].append(record["name"])
-            return grouped
+        grouped = {"active": [], "hot": [], "inactive": []}
+        for record in self._read(query):
+            status = record["status"]
+            if status in grouped:
+                grouped[status].append(record["name"])
+        return grouped
     
     def get_entities_list(self, topic: str = None, limit: int = 50) -> list[dict]:
         query = """
@@ -455,9 +755,8 @@ class MemGraphStore:
         ORDER BY e.last_mentioned DESC
         LIMIT $limit
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"topic": topic, "limit": limit})
-            return [dict(record) for record in result]
+        result = self._read(query, {"topic": topic, "limit": limit})
+        return [dict(record) for record in result]
     
     def get_mood_history(self, user_name: str, limit: int = 10) -> list[dict]:
         query = """
@@ -471,9 +770,8 @@ class MemGraphStore:
         ORDER BY m.timestamp DESC
         LIMIT $limit
         """
-        with self.driver.session() as session:
-            result = session.run(query, {"user_name": user_name, "limit": limit})
-            return [dict(record) for record in result]
+        result = self._read(query, {"user_name": user_name, "limit": limit})
+        return [dict(record) for record in result]
     
     def merge_entities(self, primary_id: int, secondary_id: int, merged_summary: str) -> bool:
         """
@@ -485,62 +783,32 @@ class MemGraphStore:
             secondary_id: Entity that gets merged and deleted
             merged_summary: Pre-computed summary (from LLM or concat)
         """
-        
-        query = """
-        MATCH (p:Entity {id: $primary_id})
-        MATCH (s:Entity {id: $secondary_id})
-
-        WITH p, s, coalesce(p.aliases, []) + coalesce(s.aliases, []) + [s.canonical_name] AS combined_aliases
-        UNWIND combined_aliases AS alias
-        WITH p, s, collect(DISTINCT alias) AS unique_aliases
-
-        SET p.aliases = unique_aliases,
-            p.summary = $summary,
-            p.confidence = CASE WHEN coalesce(s.confidence, 0) > coalesce(p.confidence, 0) THEN s.confidence ELSE p.confidence END,
-            p.last_mentioned = CASE WHEN coalesce(s.last_mentioned, 0) > coalesce(p.last_mentioned, 0) THEN s.last_mentioned ELSE p.last_mentioned END,
-            p.last_updated = timestamp()
-
-        WITH p, s
-
-        OPTIONAL MATCH (s)-[r_source:RELATED_TO]-(target:Entity)
-        WHERE target.id <> p.id
+        merged = self.merge_entities_bulk([{
+            "primary_id": primary_id,
+            "secondary_id": secondary_id,
+            "summary": merged_summary
+        }])
+        return secondary_id in merged
 
-        WITH p, s, r_source, target
-        WHERE r_source IS NOT NULL
-
-        MERGE (p)-[r_target:RELATED_TO]-(target)
-        ON CREATE SET 
-            r_target.weight = r_source.weight,
-            r_target.confidence = r_source.confidence,
-            r_target.message_ids = r_source.message_ids,
-            r_target.last_seen = r_source.last_seen
-        ON MATCH SET
-            r_target.weight = r_target.weight + r_source.weight,
-            r_target.confidence = CASE WHEN r_source.confidence > r_target.confidence THEN r_source.confidence ELSE r_target.confidence END,
-            r_target.last_seen = CASE WHEN r_source.last_seen > r_target.last_seen THEN r_source.last_seen ELSE r_target.last_seen END
-
-        WITH p, s, r_target, r_source
-        UNWIND coalesce(r_target.message_ids, []) + coalesce(r_source.message_ids, []) AS mid
-        WITH p, s, r_target, collect(DISTINCT mid) AS unique_mids
-        SET r_target.message_ids = unique_mids
-
-        WITH DISTINCT s
-        DETACH DELETE s
-        RETURN count(s) as deleted
+    def merge_entities_bulk(self, merges: List[Dict]) -> set[int]:
         """
-
+        Merge many (primary_id, secondary_id, summary) rows in one transaction.
+        Rows must be disjoint: no entity id may appear in more than one row.
+        Returns the secondary ids that were merged and deleted.
+        """
+        if not merges:
+            return set()
+        
         with self.driver.session() as session:
             try:
-                result = session.run(query, {
-                    "primary_id": primary_id, 
-                    "secondary_id": secondary_id, 
-                    "summary": merged_summary
-                })
-                record = result.single()
-                if record and record["deleted"] > 0:
-                    logger.info(f"Merged entity {secondary_id} into {primary_id}")
-                    return True
-                return False
+                record = session.run(self._Q_MERGE_ENTITIES, {"merges": merges, "now": _now_us()}).single()
+                merged = set(record["merged"]) if record else set()
+                if merged:
+                    self.invalidate_profiles()
+                for m in merges:
+                    if m["secondary_id"] in merged:
+                        logger.info(f"Merged entity {m['secondary_id']} into {m['primary_id']}")
+                return merged
             except Exception as e:
                 logger.error(f"Merge transaction failed: {e}")
-                return False
\ No newline at end of file
+                return set()
\ No newline at end of file
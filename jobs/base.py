@@ -6,7 +6,7 @@ import redis.asyncio as redis
 
 
 
-@dataclass
+@dataclass(slots=True)
 class JobContext:
     """Context passed to every job method."""
     user_name: str
@@ -15,7 +15,7 @@ class JobContext:
     last_run: Optional[datetime] = None
 
 
-@dataclass 
+@dataclass(slots=True)
 class JobResult:
     """Result returned from job execution."""
     success: bool = True
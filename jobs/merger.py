@@ -66,27 +66,38 @@ class MergeDetectionJob(BaseJob):
                     elif score >= self.HITL_THRESHOLD:
                         hitl.append(candidate)
                     else:
-                        logger.info(f"Rejected ({candidate['primary_id']}, {candidate['secondary_id']}) | LLM={score:.3f}")
+                        logger.info("Rejected ({}, {}) | LLM={:.3f}", candidate['primary_id'], candidate['secondary_id'], score)
 
                 logger.info(f"Merge split: {len(auto_merge)} auto, {len(hitl)} HITL")
                 
-                merged_ids = set()
                 successful = 0
                 failed = 0
                 
+                # Pairs sharing an id cannot be merged in the same transaction
+                # (the alias/summary writes would race); leave those for the next run
+                merges = []
+                used_ids = set()
                 for candidate in auto_merge:
                     primary_id = candidate["primary_id"]
                     secondary_id = candidate["secondary_id"]
                     
-                    if primary_id in merged_ids or secondary_id in merged_ids:
+                    if primary_id in used_ids or secondary_id in used_ids:
                         continue
                     
-                    success = await self._execute_merge(ctx.user_name, primary_id, secondary_id)
+                    merge = await self._prepare_merge(ctx.user_name, primary_id, secondary_id)
+                    if merge is None:
+                        failed += 1
+                        continue
                     
-                    if success:
-                        merged_ids.add(secondary_id)
+                    merges.append(merge)
+                    used_ids.update((primary_id, secondary_id))
+                
+                merged_ids = await self._execute_merges(merges)
+                
+                for merge in merges:
+                    if merge["secondary_id"] in merged_ids:
                         successful += 1
-                        self._sync_resolver(primary_id, secondary_id)
+                        self._sync_resolver(merge["primary_id"], merge["secondary_id"])
                     else:
                         failed += 1
                 
@@ -118,19 +129,17 @@ class MergeDetectionJob(BaseJob):
         try:
             return float(result.strip())
         except (ValueError, AttributeError):
-            logger.warning(f"Unparseable judgment for ({candidate['primary_id']}, {candidate['secondary_id']}): {result}")
+            logger.warning("Unparseable judgment for ({}, {}): {}", candidate['primary_id'], candidate['secondary_id'], result)
             return None
 
-    async def _execute_merge(self, user_name: str, primary_id: int, secondary_id: int, max_retries: int = 2) -> bool:
-        """Execute merge with retry."""
-        loop = asyncio.get_running_loop()
-        
+    async def _prepare_merge(self, user_name: str, primary_id: int, secondary_id: int) -> Optional[dict]:
+        """Build the merge row for a pair, including the LLM-merged summary."""
         primary_profile = self.ent_resolver.entity_profiles.get(primary_id, {})
         secondary_profile = self.ent_resolver.entity_profiles.get(secondary_id, {})
 
         if not primary_profile or not secondary_profile:
             logger.error(f"Merge aborted ({primary_id}, {secondary_id}): missing profile(s)")
-            return False
+            return None
         
         primary_name = primary_profile.get("canonical_name", "Unknown")
         secondary_name = secondary_profile.get("canonical_name", "Unknown")
@@ -140,41 +149,58 @@ class MergeDetectionJob(BaseJob):
                 user_name,
                 primary_name=primary_name,
                 entity_type=primary_profile.get("type", "unknown"),
-                all_aliases=list(set(
-                    self.ent_resolver.get_mentions_for_id(primary_id) +
-                    self.ent_resolver.get_mentions_for_id(secondary_id)
-                )),
+                all_aliases=list({
+                    mention
+                    for mentions in self.ent_resolver.get_mentions_for_ids((primary_id, secondary_id)).values()
+                    for mention in mentions
+                }),
                 summary_a=primary_profile.get("summary", ""),
                 summary_b=secondary_profile.get("summary", "")
             )
         except Exception as e:
             logger.error(f"Merge ({primary_id}, {secondary_id}) {primary_name} <- {secondary_name}: LLM failed - {e}")
-            return False
+            return None
+        
+        return {
+            "primary_id": primary_id,
+            "secondary_id": secondary_id,
+            "summary": merged_summary,
+            "primary_name": primary_name,
+            "secondary_name": secondary_name
+        }
+
+    async def _execute_merges(self, merges: list[dict], max_retries: int = 2) -> set[int]:
+        """Execute all merges in one store transaction, retrying whatever did not land."""
+        loop = asyncio.get_running_loop()
+        merged_ids = set()
+        pending = merges
         
         for attempt in range(1, max_retries + 1):
+            if not pending:
+                break
             try:
-                success = await loop.run_in_executor(
+                merged_ids |= await loop.run_in_executor(
                     None,
-                    self.store.merge_entities,
-                    primary_id,
-                    secondary_id,
-                    merged_summary
+                    self.store.merge_entities_bulk,
+                    pending
                 )
-                
-                if success:
-                    logger.info(f"Merged ({primary_id}, {secondary_id}) {primary_name} <- {secondary_name}")
-                    return True
-                else:
-                    logger.warning(f"Merge attempt {attempt}/{max_retries} ({primary_id}, {secondary_id}): store returned False")
-                    
             except Exception as e:
-                logger.error(f"Merge attempt {attempt}/{max_retries} ({primary_id}, {secondary_id}): {type(e).__name__} - {e}")
+                logger.error(f"Merge attempt {attempt}/{max_retries} ({len(pending)} pairs): {type(e).__name__} - {e}")
+            
+            for merge in pending:
+                if merge["secondary_id"] in merged_ids:
+                    logger.info(f"Merged ({merge['primary_id']}, {merge['secondary_id']}) {merge['primary_name']} <- {merge['secondary_name']}")
             
-            if attempt < max_retries:
-                await asyncio.sleep(2.0 * attempt)
+            pending = [m for m in pending if m["secondary_id"] not in merged_ids]
+            if pending:
+                logger.warning(f"Merge attempt {attempt}/{max_retries}: {len(pending)} pairs not merged")
+                if attempt < max_retries:
+                    await asyncio.sleep(2.0 * attempt)
+        
+        for merge in pending:
+            logger.error(f"Merge failed permanently ({merge['primary_id']}, {merge['secondary_id']}) {merge['primary_name']} <- {merge['secondary_name']}")
         
-        logger.error(f"Merge failed permanently ({primary_id}, {secondary_id}) {primary_name} <- {secondary_name}")
-        return False
+        return merged_ids
     
     async def _merge_summaries_llm(
         self,
@@ -216,8 +242,7 @@ class MergeDetectionJob(BaseJob):
         secondary_aliases = self.ent_resolver.get_mentions_for_id(secondary_id)
         
         with self.ent_resolver._lock:
-            for alias in secondary_aliases:
-                self.ent_resolver._name_to_id[alias.lower()] = primary_id
+            self.ent_resolver._index_names(secondary_aliases, primary_id)
             
             if secondary_id in self.ent_resolver.entity_profiles:
                 del self.ent_resolver.entity_profiles[secondary_id]
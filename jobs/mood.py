@@ -30,7 +30,7 @@ class MoodCheckpointJob(BaseJob):
         
         emotions = [e.decode() if isinstance(e, bytes) else e for e in raw_emotions]
         
-        self._write_checkpoint(ctx.user_name, emotions)
+        self._write_checkpoint(emotions)
         
         return JobResult(success=True, summary=f"Logged checkpoint: {len(emotions)} emotions")
 
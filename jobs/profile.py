@@ -42,7 +42,7 @@ class ProfileRefinementJob(BaseJob):
         dirty_key = f"dirty_entities:{ctx.user_name}"
         return await ctx.redis.scard(dirty_key) > 0
     
-    async def _maybe_refine_user(self, ctx: JobContext, dirty_count: int) -> bool:
+    async def _maybe_refine_user(self, ctx: JobContext, dirty_count: int, recent_context: Optional[List[tuple]] = None) -> bool:
         """
         Check conditions and trigger user profile refinement if needed.
         Returns True if refinement ran.
@@ -64,7 +64,7 @@ class ProfileRefinementJob(BaseJob):
             logger.warning(f"User profile {user_id} not found")
             return False
         
-        success = await self._refine_user_profile(ctx, user_id, profile)
+        success = await self._refine_user_profile(ctx, user_id, profile, recent_context)
 
         await ctx.redis.setex(ran_key, 300, "true")
         
@@ -83,43 +83,21 @@ class ProfileRefinementJob(BaseJob):
             entity_ids = [int(id_str) for id_str in raw_ids if int(id_str) != user_id] if raw_ids else []
             
             updates = []
+            recent_context = None
             
             if entity_ids:
-                sorted_set_key = f"recent_messages:{ctx.user_name}"
-                recent_msg_ids = await ctx.redis.zrevrange(sorted_set_key, 0, self.MSG_WINDOW - 1)
+                recent_context = await self._fetch_recent_context(ctx, self.MSG_WINDOW)
                 
-                if not recent_msg_ids:
+                if not recent_context:
                     await ctx.redis.sadd(dirty_key, *[str(eid) for eid in entity_ids])
                     return JobResult(success=False, summary="No context messages found")
                 
-                msg_data_list = await ctx.redis.hmget(f"message_content:{ctx.user_name}", *recent_msg_ids)
-                
-                recent_context = []
-                now = datetime.now()
-                
-                for msg_data in msg_data_list:
-                    if msg_data:
-                        parsed = json.loads(msg_data)
-                        raw = parsed['message']
-                        ts = datetime.fromisoformat(parsed['timestamp'])
-                        
-                        delta = (now - ts).total_seconds()
-                        if delta < 3600:
-                            mins = int(delta // 60)
-                            relative = f"{mins}m ago" if mins > 1 else "just now"
-                        elif delta < 86400:
-                            relative = f"{int(delta // 3600)}h ago"
-                        else:
-                            relative = f"{int(delta // 86400)}d ago"
-                        
-                        recent_context.append((f"({relative}) {raw}", raw))
-                
                 updates = await self._run_updates(ctx, entity_ids, recent_context)
                 
                 if updates:
                     await self._write_updates(updates)
             
-            user_refined = await self._maybe_refine_user(ctx, dirty_count)
+            user_refined = await self._maybe_refine_user(ctx, dirty_count, recent_context)
             
             parts = []
             if updates:
@@ -145,19 +123,19 @@ class ProfileRefinementJob(BaseJob):
             return response[start:end].strip()
         return response.strip()
     
-    async def _refine_user_profile(self, ctx: JobContext, user_id: int, profile: dict) -> bool:
-        """Execute user profile refinement."""
+    async def _fetch_recent_context(self, ctx: JobContext, count: int) -> List[tuple]:
+        """Newest `count` messages as (relative-time formatted, raw) pairs."""
         sorted_set_key = f"recent_messages:{ctx.user_name}"
-        recent_msg_ids = await ctx.redis.zrevrange(sorted_set_key, 0, self.USER_MSG_COUNT - 1)
+        recent_msg_ids = await ctx.redis.zrevrange(sorted_set_key, 0, count - 1)
         
         if not recent_msg_ids:
-            return False
+            return []
         
         msg_data_list = await ctx.redis.hmget(
             f"message_content:{ctx.user_name}", *recent_msg_ids
         )
         
-        observations = []
+        recent_context = []
         now = datetime.now()
         
         for msg_data in msg_data_list:
@@ -175,7 +153,17 @@ class ProfileRefinementJob(BaseJob):
                 else:
                     relative = f"{int(delta // 86400)}d ago"
                 
-                observations.append(f"({relative}) {raw}")
+                recent_context.append((f"({relative}) {raw}", raw))
+        
+        return recent_context
+    
+    async def _refine_user_profile(self, ctx: JobContext, user_id: int, profile: dict, recent_context: Optional[List[tuple]] = None) -> bool:
+        """Execute user profile refinement."""
+        # The entity pass already fetched a wider window; reuse its head
+        if recent_context is None:
+            recent_context = await self._fetch_recent_context(ctx, self.USER_MSG_COUNT)
+        
+        observations = [formatted for formatted, _ in recent_context[:self.USER_MSG_COUNT]]
         
         if not observations:
             return False
@@ -231,6 +219,7 @@ class ProfileRefinementJob(BaseJob):
         current_msg_id = int(current_msg_id) if current_msg_id else 0
         
         semaphore = asyncio.Semaphore(5)
+        mentions_by_id = self.resolver.get_mentions_for_ids(entity_ids)
 
         async def update_single(ent_id: int) -> Optional[dict]:
             async with semaphore:
@@ -242,7 +231,7 @@ class ProfileRefinementJob(BaseJob):
                 entity_type = profile.get("type", "unknown")
                 existing_summary = profile.get("summary", "")
 
-                mentions = self.resolver.get_mentions_for_id(ent_id)
+                mentions = mentions_by_id[ent_id]
                 if not mentions:
                     return None
 
@@ -300,18 +289,10 @@ class ProfileRefinementJob(BaseJob):
         """Write profile updates directly to Memgraph."""
         loop = asyncio.get_running_loop()
         
-        for update in updates:
-            await loop.run_in_executor(
-                self.executor,
-                partial(
-                    self.store.update_entity_profile,
-                    entity_id=update["id"],
-                    canonical_name=update["canonical_name"],
-                    summary=update["summary"],
-                    embedding=update["embedding"],
-                    last_msg_id=update["last_msg_id"],
-                    topic=update["topic"]
-                )
-            )
+        await loop.run_in_executor(
+            self.executor,
+            self.store.update_entity_profiles,
+            updates
+        )
         
         logger.info(f"Wrote {len(updates)} profile updates to graph")
\ No newline at end of file
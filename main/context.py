@@ -251,13 +251,17 @@ class Context:
         await self.add_to_redis(msg)
 
         buffer_key = f"buffer:{self.user_name}"
-        await self.redis_client.rpush(buffer_key, json.dumps({
+        checkpoint_key = f"checkpoint_count:{self.user_name}"
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.rpush(buffer_key, json.dumps({
             "id": msg.id,
             "message": msg.message.strip(),
             "timestamp": msg.timestamp.isoformat()
         }))
+        pipe.incr(checkpoint_key)
+        buffer_len, count = await pipe.execute()
 
-        buffer_len = await self.redis_client.llen(buffer_key)
         await self.scheduler.record_activity()
         
         if buffer_len >= BATCH_SIZE:
@@ -267,9 +271,6 @@ class Context:
             self._fire_and_forget(self.process_batch())
         elif buffer_len == 1:
             self._batch_timer_task = asyncio.create_task(self._flush_batch_timeout())
-        
-        checkpoint_key = f"checkpoint_count:{self.user_name}"
-        count = await self.redis_client.incr(checkpoint_key)
 
         if count >= SESSION_WINDOW // 2:
             await self.redis_client.set(checkpoint_key, 0)
@@ -308,7 +309,7 @@ class Context:
     async def add_to_redis(self, msg: MessageData):
         msg_key = f"msg_{msg.id}"
         
-        pipe = self.redis_client.pipeline()
+        pipe = self.redis_client.pipeline(transaction=False)
 
         pipe.hset(f"message_content:{self.user_name}", msg_key, json.dumps({
             'message': msg.message.strip(),
@@ -317,7 +318,10 @@ class Context:
         pipe.zadd(f"recent_messages:{self.user_name}", {msg_key: msg.timestamp.timestamp()})
         pipe.zremrangebyrank(f"recent_messages:{self.user_name}", 0, -(SESSION_WINDOW + 1))
         await pipe.execute()
-        self.ent_resolver.add_message(msg_key, msg.message.strip())
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor, self.ent_resolver.add_message, msg_key, msg.message.strip()
+        )
 
 
     async def process_batch(self):
@@ -350,7 +354,8 @@ class Context:
                         result.entity_ids,
                         result.new_entity_ids,
                         result.alias_updated_ids,
-                        result.extraction_result
+                        result.extraction_result,
+                        result.new_entity_embeddings
                     )
             
             await self.redis_client.ltrim(buffer_key, len(messages), -1)
@@ -362,10 +367,16 @@ class Context:
         entity_ids: list[int],
         new_entity_ids: set[int],
         alias_updated_ids: set[int],
-        extraction_result: ConnectionExtractionResponse
+        extraction_result: ConnectionExtractionResponse,
+        new_entity_embeddings: dict[int, list[float]] = None
     ):
 
    
+        new_entity_embeddings = new_entity_embeddings or {}
+        mentions_by_id = self.ent_resolver.get_mentions_for_ids(
+            set(entity_ids) | new_entity_ids | alias_updated_ids
+        )
+
         entity_lookup = {}
         for ent_id in entity_ids:
             profile = self.ent_resolver.entity_profiles.get(ent_id)
@@ -378,8 +389,9 @@ class Context:
                     "topic": profile.get("topic", "General")
                 }
                 entity_lookup[canonical.lower()] = entry
-                for mention in self.ent_resolver.get_mentions_for_id(ent_id):
-                    entity_lookup[mention.lower()] = entry
+                # resolver mentions are already lowercased index keys
+                for mention in mentions_by_id[ent_id]:
+                    entity_lookup[mention] = entry
 
         entities = []
         for ent_id in new_entity_ids:
@@ -392,8 +404,8 @@ class Context:
                     "confidence": 1.0,
                     "summary": "",
                     "topic": profile.get("topic", "General"),
-                    "embedding": self.ent_resolver.get_embedding_for_id(ent_id),
-                    "aliases": self.ent_resolver.get_mentions_for_id(ent_id)
+                    "embedding": new_entity_embeddings.get(ent_id) or self.ent_resolver.get_embedding_for_id(ent_id),
+                    "aliases": mentions_by_id[ent_id]
                 })
         
         for ent_id in alias_updated_ids:
@@ -409,26 +421,36 @@ class Context:
                     "summary": "",
                     "topic": profile.get("topic", "General"),
                     "embedding": [],
-                    "aliases": self.ent_resolver.get_mentions_for_id(ent_id)
+                    "aliases": mentions_by_id[ent_id]
                 })
 
-        relationships = []
+        # One edge write per (unordered pair, message); keep the strongest confidence
+        pair_writes = {}
         for msg_result in extraction_result.message_results:
-            msg_id = msg_result.message_id
+            msg_key = f"msg_{msg_result.message_id}"
             
             for pair in msg_result.entity_pairs:
                 ent_a = entity_lookup.get(pair.entity_a.lower())
                 ent_b = entity_lookup.get(pair.entity_b.lower())
                 
                 if ent_a and ent_b:
-                    relationships.append({
-                        "entity_a": ent_a["canonical_name"],
-                        "entity_b": ent_b["canonical_name"],
-                        "message_id": f"msg_{msg_id}",
-                        "confidence": pair.confidence
-                    })
+                    key = (frozenset((ent_a["id"], ent_b["id"])), msg_key)
+                    existing = pair_writes.get(key)
+                    if existing is None or pair.confidence > existing["confidence"]:
+                        pair_writes[key] = {
+                            "id_a": ent_a["id"],
+                            "id_b": ent_b["id"],
+                            "message_id": msg_key,
+                            "confidence": pair.confidence
+                        }
                 else:
-                    logger.warning(f"Skipping pair: {pair.entity_a} - {pair.entity_b}")
+                    logger.warning("Skipping pair: {} - {}", pair.entity_a, pair.entity_b)
+        
+        relationships = list(pair_writes.values())
+
+        if not entities and not relationships:
+            logger.info("Nothing to write to graph for this batch")
+            return
 
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
@@ -1,13 +1,18 @@
+from collections import OrderedDict
 from datetime import datetime, timezone
 from loguru import logger
 import threading
 from typing import Dict, List, Optional, Tuple
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from db.memgraph import MemGraphStore
 
+HYDRATION_CHUNK = 1000
+MERGE_SCAN_BLOCK = 256
+ENCODE_BATCH_SIZE = 32
+ENCODE_CACHE_SIZE = 1000
 
 
 class EntityResolver:
@@ -24,6 +29,8 @@ class EntityResolver:
         self.msg_index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
         self.msg_int_to_id: dict[int, str] = {}
         self._lock = threading.RLock()
+        self._encode_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._encode_cache_lock = threading.Lock()
 
     
         self._hydrate_from_store()
@@ -31,25 +38,18 @@ class EntityResolver:
     def _hydrate_from_store(self):
         """Populate all resolver structures from Memgraph."""
         try:
-            entities = self.store.get_all_entities_for_hydration()
-            
-            if not entities:
-                logger.info("No entities in Memgraph. Starting fresh.")
-                return
-            
             ids = []
             vectors = []
+            vector_count = 0
             
             with self._lock:
-                for ent in entities:
+                for ent in self.store.iter_entities_for_hydration():
                     ent_id = ent["id"]
                     canonical = ent["canonical_name"]
                     aliases = ent["aliases"] or []
                     embedding = ent["embedding"]
                     
-                    self._name_to_id[canonical.lower()] = ent_id
-                    for alias in aliases:
-                        self._name_to_id[alias.lower()] = ent_id
+                    self._index_names([canonical, *aliases], ent_id)
                     
                     self.entity_profiles[ent_id] = {
                         "canonical_name": canonical,
@@ -61,30 +61,82 @@ class EntityResolver:
                     if embedding and len(embedding) == self.embedding_dim:
                         ids.append(ent_id)
                         vectors.append(embedding)
+                    
+                    if len(ids) >= HYDRATION_CHUNK:
+                        vector_count += self._add_hydrated_vectors(ids, vectors)
+                        ids, vectors = [], []
                 
-                if ids:
-                    self.index_id_map.add_with_ids(
-                        np.array(vectors, dtype=np.float32),
-                        np.array(ids, dtype=np.int64)
-                    )
+                vector_count += self._add_hydrated_vectors(ids, vectors)
             
-            logger.info(f"Hydrated {len(self.entity_profiles)} entities, {len(ids)} vectors from Memgraph")
+            if not self.entity_profiles:
+                logger.info("No entities in Memgraph. Starting fresh.")
+                return
+            
+            logger.info(f"Hydrated {len(self.entity_profiles)} entities, {vector_count} vectors from Memgraph")
             
         except Exception as e:
             logger.error(f"Hydration failed: {e}")
             raise
 
+    def _add_hydrated_vectors(self, ids: List[int], vectors: List[List[float]]) -> int:
+        if not ids:
+            return 0
+        self.index_id_map.add_with_ids(
+            np.array(vectors, dtype=np.float32),
+            np.array(ids, dtype=np.int64)
+        )
+        return len(ids)
+
     def get_mentions(self) -> Dict[str, int]:
         """Get copy of _name_to_id for persistence."""
         with self._lock:
             return self._name_to_id.copy()
     
+    def _index_names(self, names, entity_id: int):
+        """Point every name at entity_id. All writes to _name_to_id go through here so keys stay lowercased."""
+        self._name_to_id.update(dict.fromkeys((name.lower() for name in names), entity_id))
+    
     def get_id(self, name: str) -> Optional[int]:
         return self._name_to_id.get(name.lower())
     
+    def batch_resolve(self, names: List[str], score_cutoff: float = 85) -> List[Optional[int]]:
+        """
+        Resolve many names to entity IDs at once. Exact alias hits first,
+        then a single WRatio cdist pass over the alias table for the misses.
+        """
+        with self._lock:
+            ids = [self._name_to_id.get(name.lower()) for name in names]
+            misses = [i for i, ent_id in enumerate(ids) if ent_id is None]
+            if not misses or not self._name_to_id:
+                return ids
+            choices = list(self._name_to_id.keys())
+            choice_ids = list(self._name_to_id.values())
+        
+        scores = process.cdist(
+            [names[i] for i in misses],
+            choices,
+            scorer=fuzz.WRatio,
+            score_cutoff=score_cutoff,
+            workers=-1
+        )
+        for i, row in zip(misses, scores):
+            best = int(row.argmax())
+            if row[best] > 0:
+                ids[i] = choice_ids[best]
+        
+        return ids
+    
     def get_mentions_for_id(self, entity_id: int) -> List[str]:
         return [mention for mention, eid in self._name_to_id.items() if eid == entity_id]
     
+    def get_mentions_for_ids(self, entity_ids) -> Dict[int, List[str]]:
+        """get_mentions_for_id for many ids in a single pass over the name index."""
+        mentions = {eid: [] for eid in entity_ids}
+        for mention, eid in self._name_to_id.items():
+            if eid in mentions:
+                mentions[eid].append(mention)
+        return mentions
+    
     def get_embedding_for_id(self, entity_id: int) -> List[float]:
         """Retrieve embedding from FAISS by ID."""
         with self._lock:
@@ -95,6 +147,47 @@ class EntityResolver:
                 logger.warning(f"Could not retrieve embedding for {entity_id}: {e}")
                 return []
     
+    def _encode(self, texts: List[str], cache: bool = True) -> np.ndarray:
+        """
+        Unit-normalised float32 embeddings, ready for the inner-product indexes.
+        Recently encoded texts are served from a bounded LRU; only misses hit the model.
+        Pass cache=False for one-off texts (messages) so they don't evict names and queries.
+        """
+        if not cache:
+            return self._encode_model(texts)
+        
+        out = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        misses = {}
+        with self._encode_cache_lock:
+            for i, text in enumerate(texts):
+                cached = self._encode_cache.get(text)
+                if cached is None:
+                    misses.setdefault(text, []).append(i)
+                else:
+                    self._encode_cache.move_to_end(text)
+                    out[i] = cached
+        
+        if misses:
+            miss_texts = list(misses)
+            embs = self._encode_model(miss_texts)
+            
+            with self._encode_cache_lock:
+                for text, emb in zip(miss_texts, embs):
+                    out[misses[text]] = emb
+                    self._encode_cache[text] = emb.copy()
+                while len(self._encode_cache) > ENCODE_CACHE_SIZE:
+                    self._encode_cache.popitem(last=False)
+        
+        return out
+
+    def _encode_model(self, texts: List[str]) -> np.ndarray:
+        return self.embedding_model.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
     def hydrate_messages(self, messages: dict[str, dict]):
         if not messages:
             return
@@ -105,22 +198,22 @@ class EntityResolver:
             ids.append(int_id)
             texts.append(data["message"])
         
-        embs = self.embedding_model.encode(texts)
-        faiss.normalize_L2(embs)
+        embs = self._encode(texts, cache=False)
         self.msg_index.add_with_ids(embs, np.array(ids, dtype=np.int64))
 
     def add_message(self, msg_id: str, text: str):
         int_id = int(msg_id.split("_")[1])
-        self.msg_int_to_id[int_id] = msg_id
-        emb = self.embedding_model.encode([text])
-        faiss.normalize_L2(emb)
-        self.msg_index.add_with_ids(emb, np.array([int_id], dtype=np.int64))
+        emb = self._encode([text], cache=False)
+        with self._lock:
+            self.msg_int_to_id[int_id] = msg_id
+            self.msg_index.add_with_ids(emb, np.array([int_id], dtype=np.int64))
 
     def search_messages(self, query: str, k: int = 5) -> list[tuple[str, float]]:
-        q_emb = self.embedding_model.encode([query])
-        faiss.normalize_L2(q_emb)
-        scores, ids = self.msg_index.search(q_emb, k)
-        return [(self.msg_int_to_id[int(i)], float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+        q_emb = self._encode([query])
+        # add_message writes from executor threads; search and id lookup must not interleave with it
+        with self._lock:
+            scores, ids = self.msg_index.search(q_emb, k)
+            return [(self.msg_int_to_id[int(i)], float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
     
     def validate_existing(self, canonical_name: str, mentions: List[str]) -> Tuple[Optional[int], bool]:
         """
@@ -129,15 +222,12 @@ class EntityResolver:
         """
         with self._lock:
             entity_id = self.get_id(canonical_name)
-            logger.debug(f"validate_existing: '{canonical_name}' -> id={entity_id}")
+            logger.debug("validate_existing: '{}' -> id={}", canonical_name, entity_id)
             if entity_id is None:
                 return None, False
             
-            new_aliases = {}
-            for mention in mentions:
-                if mention.lower() not in self._name_to_id:
-                    self._name_to_id[mention.lower()] = entity_id
-                    new_aliases[mention] = entity_id
+            new_aliases = [mention for mention in mentions if mention.lower() not in self._name_to_id]
+            self._index_names(new_aliases, entity_id)
 
             return entity_id, len(new_aliases) > 0
     
@@ -152,53 +242,103 @@ class EntityResolver:
         """
         Register new entity: update all indexes and return embedding.
         """
-        profile = {
+        return self.register_entities([(entity_id, canonical_name, mentions, entity_type, topic)])[0]
+
+    def register_entities(self, entries: List[Tuple[int, str, List[str], str, str]]) -> List[List[float]]:
+        """
+        Register several new entities with one encode call and one index insert.
+        Entries are (entity_id, canonical_name, mentions, entity_type, topic).
+        Nothing is name-indexed unless the embedding step succeeds.
+        """
+        items = [
+            (entity_id, self._new_profile(canonical_name, entity_type, topic))
+            for entity_id, canonical_name, _, entity_type, topic in entries
+        ]
+        embeddings = self.embed_entities(items)
+        
+        with self._lock:
+            self._store_profiles(items)
+            for entity_id, canonical_name, mentions, _, _ in entries:
+                self._index_names([canonical_name, *mentions], entity_id)
+        
+        return embeddings
+
+    def index_new_entity(
+        self, 
+        entity_id: int, 
+        canonical_name: str, 
+        mentions: List[str], 
+        entity_type: str, 
+        topic: str
+    ) -> Dict:
+        """
+        Make a new entity resolvable by name immediately; its vector is added
+        later by embed_entities. Returns the stored profile.
+        """
+        profile = self._new_profile(canonical_name, entity_type, topic)
+        with self._lock:
+            self._store_profiles([(entity_id, profile)])
+            self._index_names([canonical_name, *mentions], entity_id)
+        return profile
+
+    def drop_entities(self, entity_ids) -> None:
+        """Undo index_new_entity for entities whose embedding step failed."""
+        entity_ids = set(entity_ids)
+        with self._lock:
+            for entity_id in entity_ids:
+                self.entity_profiles.pop(entity_id, None)
+            for name in [name for name, eid in self._name_to_id.items() if eid in entity_ids]:
+                del self._name_to_id[name]
+
+    @staticmethod
+    def _new_profile(canonical_name: str, entity_type: str, topic: str) -> Dict:
+        return {
             "canonical_name": canonical_name,
             "type": entity_type,
             "topic": topic,
             "summary": ""
         }
-        
-        embedding = self.add_entity(entity_id, profile)
-        
-        with self._lock:
-            self._name_to_id[canonical_name.lower()] = entity_id
-            for mention in mentions:
-                self._name_to_id[mention.lower()] = entity_id
-
-        return embedding
 
     def add_entity(self, entity_id: int, profile: Dict) -> List[float]:
-
-        canonical_name = profile.get("canonical_name", "")
-        summary = profile.get("summary", "") or ""
-
-        resolution_text = f"{canonical_name}. {summary}"
-        embedding_np = self.embedding_model.encode([resolution_text])[0]
-        faiss.normalize_L2(embedding_np.reshape(1, -1))
-
-
+        embedding = self.embed_entities([(entity_id, profile)])[0]
         with self._lock:
+            self._store_profiles([(entity_id, profile)])
+        return embedding
+
+    def _store_profiles(self, items: List[Tuple[int, Dict]]):
+        now = datetime.now(timezone.utc).isoformat()
+        for entity_id, profile in items:
 
             #TODO: eventually need to make a better LRU system
             if len(self.entity_profiles) >= 10000:
                 oldest_id = next(iter(self.entity_profiles))
                 del self.entity_profiles[oldest_id]
                 
-            logger.info(f"Adding entity {entity_id}-{profile["canonical_name"]} to resolver indexes.")
+            logger.info("Adding entity {}-{} to resolver indexes.", entity_id, profile["canonical_name"])
 
             profile.setdefault("topic", "General")
-            profile.setdefault("first_seen", datetime.now(timezone.utc).isoformat())
-            profile["last_seen"] = datetime.now(timezone.utc).isoformat()
-            
+            profile.setdefault("first_seen", now)
+            profile["last_seen"] = now
+            self.entity_profiles[entity_id] = profile
+
+    def embed_entities(self, items: List[Tuple[int, Dict]]) -> List[List[float]]:
+        """Encode (entity_id, profile) pairs in one call and add them to the vector index."""
+        if not items:
+            return []
+
+        resolution_texts = [
+            f"{profile.get('canonical_name', '')}. {profile.get('summary', '') or ''}"
+            for _, profile in items
+        ]
+        embeddings_np = self._encode(resolution_texts)
+
+        with self._lock:
             self.index_id_map.add_with_ids(
-                np.array([embedding_np]), 
-                np.array([entity_id], dtype=np.int64)
+                embeddings_np, 
+                np.array([entity_id for entity_id, _ in items], dtype=np.int64)
             )
-
-            self.entity_profiles[entity_id] = profile
         
-        return embedding_np.tolist()
+        return embeddings_np.tolist()
     
 
     def update_profile_summary(self, entity_id: int, new_summary: str) -> List[float]:
@@ -217,8 +357,7 @@ class EntityResolver:
             profile["last_seen"] = datetime.now(timezone.utc).isoformat()
             
             resolution_text = f"{canonical_name}. {new_summary[:200]}"
-            embedding_np = self.embedding_model.encode([resolution_text])[0]
-            faiss.normalize_L2(embedding_np.reshape(1, -1))
+            embedding_np = self._encode([resolution_text])[0]
 
             self.index_id_map.remove_ids(np.array([entity_id], dtype=np.int64))
             self.index_id_map.add_with_ids(
@@ -235,44 +374,55 @@ class EntityResolver:
         
         candidates = []
         seen_pairs = {}
-        aliases = list(self._name_to_id.keys())
-        for i in range(len(aliases)):
-            for j in range(i + 1, len(aliases)):
-                id_i = self._name_to_id[aliases[i]]
-                id_j = self._name_to_id[aliases[j]]
-                if id_i == id_j:
-                    continue
-                score = fuzz.WRatio(aliases[i], aliases[j])
-                if score >= 85:
-                    pair_key = tuple(sorted([id_i, id_j]))
-                    if pair_key not in seen_pairs or score > seen_pairs[pair_key]:
-                        seen_pairs[pair_key] = score
-                    
-
+        with self._lock:
+            aliases = list(self._name_to_id.keys())
+            alias_ids = np.fromiter(self._name_to_id.values(), dtype=np.int64, count=len(aliases))
         
+        # All-pairs WRatio in cdist blocks; float32 keeps scores unrounded for the >= 95 check
+        for start in range(0, len(aliases), MERGE_SCAN_BLOCK):
+            block = process.cdist(
+                aliases[start:start + MERGE_SCAN_BLOCK],
+                aliases,
+                scorer=fuzz.WRatio,
+                score_cutoff=85,
+                dtype=np.float32,
+                workers=-1
+            )
+            rows, cols = np.nonzero(block)
+            rows += start
+            keep = (cols > rows) & (alias_ids[rows] != alias_ids[cols])
+            
+            for i, j in zip(rows[keep].tolist(), cols[keep].tolist()):
+                score = float(block[i - start, j])
+                id_i, id_j = int(alias_ids[i]), int(alias_ids[j])
+                pair_key = (id_i, id_j) if id_i < id_j else (id_j, id_i)
+                if pair_key not in seen_pairs or score > seen_pairs[pair_key]:
+                    seen_pairs[pair_key] = score
+        
+        # Flat adjacency for every candidate entity in one query; answers direct-edge checks too
+        adjacency = self.store.get_neighbor_ids_bulk(list({eid for pair in seen_pairs for eid in pair}))
+
         for (id_a, id_b), fuzz_score in seen_pairs.items():
-            if self.store.has_direct_edge(id_a, id_b):
-                logger.debug(f"Blocked ({id_a}, {id_b}) | Direct edge exists")
+            neighbors_a = adjacency[id_a]
+            if id_b in neighbors_a:
+                logger.debug("Blocked ({}, {}) | Direct edge exists", id_a, id_b)
                 continue
             profile_a = self.entity_profiles.get(id_a, {})
             profile_b = self.entity_profiles.get(id_b, {})
             type_a = profile_a.get("type")
             type_b = profile_b.get("type")
 
-            neighbors_a = self.store.get_neighbor_ids(id_a)
-            neighbors_b = self.store.get_neighbor_ids(id_b)
-            neighbors_a.discard(1) # user id - hardcoded for now
-            neighbors_b.discard(1)
+            neighbors_b = adjacency[id_b]
             
-            shared_neighbors = neighbors_a & neighbors_b
+            shared_neighbors = (neighbors_a & neighbors_b) - {1} # user id - hardcoded for now
             if shared_neighbors:
                 high_confidence = fuzz_score >= 95 and type_a and type_b and type_a == type_b
             
                 if not high_confidence:
-                    logger.debug(f"Blocked ({id_a}, {id_b}) | Shared neighbors: {shared_neighbors} (score={fuzz_score}, types={type_a}/{type_b})")
+                    logger.debug("Blocked ({}, {}) | Shared neighbors: {} (score={}, types={}/{})", id_a, id_b, shared_neighbors, fuzz_score, type_a, type_b)
                     continue
                 else:
-                    logger.info(f"Passed ({id_a}, {id_b}) | Shared neighbors as supporting evidence (score={fuzz_score}, type={type_a})")
+                    logger.info("Passed ({}, {}) | Shared neighbors as supporting evidence (score={}, type={})", id_a, id_b, fuzz_score, type_a)
             
             candidates.append({
                 "primary_id": id_a,
@@ -285,7 +435,7 @@ class EntityResolver:
                 "shared_neighbor_count": len(shared_neighbors)
             })
             
-            logger.info(f"Candidate ({id_a}, {id_b}) {profile_a.get('canonical_name')} <-> {profile_b.get('canonical_name')} | score={fuzz_score}")
+            logger.info("Candidate ({}, {}) {} <-> {} | score={}", id_a, id_b, profile_a.get('canonical_name'), profile_b.get('canonical_name'), fuzz_score)
     
         logger.info(f"Merge detection complete: {len(candidates)} candidates found")
         return candidates
\ No newline at end of file
@@ -57,4 +57,18 @@ class NLPPipeline:
             results = self.emotion_classifier(text)
             return results[0] if results else []
         except Exception:
-            return []
\ No newline at end of file
+            return []
+
+    def analyze_emotions(self, texts: List[str], batch_size: int = 32) -> List[List[dict]]:
+        """Batched variant of analyze_emotion; output is aligned with texts."""
+        valid = [i for i, t in enumerate(texts) if t and t.strip()]
+        out: List[List[dict]] = [[] for _ in texts]
+        if not valid:
+            return out
+        try:
+            results = self.emotion_classifier([texts[i] for i in valid], batch_size=batch_size)
+        except Exception:
+            return out
+        for i, res in zip(valid, results):
+            out[i] = res or []
+        return out
@@ -2,7 +2,6 @@
 import json
 import time
 import asyncio
-from functools import partial
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 import redis.asyncio as redis
@@ -25,12 +24,13 @@ from schema.dtypes import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchResult:
     """Result of processing a batch of messages."""
     entity_ids: List[int] = field(default_factory=list)
     new_entity_ids: Set[int] = field(default_factory=set)
     alias_updated_ids: Set[int] = field(default_factory=set)
+    new_entity_embeddings: Dict[int, List[float]] = field(default_factory=dict)
     extraction_result: Optional[ConnectionExtractionResponse] = None
     emotions: List[str] = field(default_factory=list)
     success: bool = True
@@ -70,7 +70,10 @@ class BatchProcessor:
         if not messages:
             return result
         
-        logger.debug(f"Processing batch of {len(messages)} messages: {[m['id'] for m in messages]}")
+        logger.opt(lazy=True).debug(
+            "Processing batch of {} messages: {}",
+            lambda: len(messages), lambda: [m['id'] for m in messages]
+        )
         
         try:
             mentions_dict, emotions = await self._extract_mentions(messages)
@@ -91,10 +94,11 @@ class BatchProcessor:
                 result.error = "VEGAPUNK-02 returned empty disambiguation"
                 return result
             
-            entity_ids, new_ids, alias_ids = await self._resolve(disambiguation)
+            entity_ids, new_ids, alias_ids, embeddings = await self._resolve(disambiguation)
             result.entity_ids = entity_ids
             result.new_entity_ids = new_ids
             result.alias_updated_ids = alias_ids
+            result.new_entity_embeddings = embeddings
             
             user_id = self.ent_resolver.get_id(self.user_name)
             if user_id and user_id not in entity_ids:
@@ -118,24 +122,22 @@ class BatchProcessor:
         loop = asyncio.get_running_loop()
         
         combined_text = "\n".join([f"[MSG {m['id']}]: {m['message']}" for m in messages])
-        mentions = await self.nlp.extract_mentions(self.user_name, self.topics, combined_text)
+        
+        # LLM NER is network-bound and the classifier runs on the executor, so overlap them
+        mentions, all_emotions = await asyncio.gather(
+            self.nlp.extract_mentions(self.user_name, self.topics, combined_text),
+            loop.run_in_executor(
+                self.executor, self.nlp.analyze_emotions, [m["message"] for m in messages]
+            )
+        )
         
         unique_mentions: Dict[str, Dict] = {}
         for text, typ, topic in mentions:
             if text not in unique_mentions:
                 unique_mentions[text] = {"type": typ, "topic": topic}
         
-        emotion_tasks = [
-            loop.run_in_executor(self.executor, self.nlp.analyze_emotion, m["message"])
-            for m in messages
-        ]
-        all_emotions = await asyncio.gather(*emotion_tasks)
-        
-        emotions = []
-        for emotion_list in all_emotions:
-            if emotion_list:
-                dominant = max(emotion_list, key=lambda x: x["score"])
-                emotions.append(dominant["label"])
+        # top_k=None output is already sorted by score, highest first
+        emotions = [emotion_list[0]["label"] for emotion_list in all_emotions if emotion_list]
         
         return unique_mentions, emotions
 
@@ -143,7 +145,10 @@ class BatchProcessor:
         matched_ids = set()
         known = []
         
-        for mention_name, _, _ in mentions:
+        # Store lookup is case-insensitive, so query each distinct name once
+        names = {name.lower(): name for name, _, _ in mentions}
+        
+        for mention_name in names.values():
             entities = self.store.get_entities_by_name(mention_name)
             for ent in entities:
                 if ent["id"] not in matched_ids:
@@ -193,14 +198,18 @@ class BatchProcessor:
         result = await self.llm.call_structured(system_03, user_03, DisambiguationResult)
         return result or DisambiguationResult(entries=[])
 
-    async def _resolve(self, disambiguation: DisambiguationResult) -> Tuple[List[int], Set[int], Set[int]]:
-        """Validate disambiguation, update resolver. Returns (all_ids, new_ids, alias_updated_ids)."""
+    async def _resolve(
+        self, disambiguation: DisambiguationResult
+    ) -> Tuple[List[int], Set[int], Set[int], Dict[int, List[float]]]:
+        """Validate disambiguation, update resolver. Returns (all_ids, new_ids, alias_updated_ids, new_embeddings)."""
         
         loop = asyncio.get_running_loop()
         
         entity_ids = []
+        seen_ids = set()
         new_ids = set()
         alias_ids = set()
+        pending = []
         
         for entry in disambiguation.entries:
             if entry.verdict == "EXISTING":
@@ -208,16 +217,12 @@ class BatchProcessor:
                     entry.canonical_name, entry.mentions
                 )
                 if ent_id is None:
-                    logger.warning(f"EXISTING '{entry.canonical_name}' not found, demoting to NEW")
+                    logger.warning("EXISTING '{}' not found, demoting to NEW", entry.canonical_name)
                     canonical = entry.mentions[0]
                     ent_id = await self._get_next_ent_id()
-                    await loop.run_in_executor(
-                        self.executor,
-                        partial(
-                            self.ent_resolver.register_entity,
-                            ent_id, canonical, entry.mentions, entry.entity_type, entry.topic
-                        )
-                    )
+                    pending.append((ent_id, self.ent_resolver.index_new_entity(
+                        ent_id, canonical, entry.mentions, entry.entity_type, entry.topic
+                    )))
                     new_ids.add(ent_id)
                 elif aliases_added:
                     alias_ids.add(ent_id)
@@ -228,18 +233,27 @@ class BatchProcessor:
                     else entry.mentions[0]
                 )
                 ent_id = await self._get_next_ent_id()
-                await loop.run_in_executor(
-                    self.executor,
-                    partial(
-                        self.ent_resolver.register_entity,
-                        ent_id, canonical, entry.mentions, entry.entity_type, entry.topic
-                    )
-                )
+                pending.append((ent_id, self.ent_resolver.index_new_entity(
+                    ent_id, canonical, entry.mentions, entry.entity_type, entry.topic
+                )))
                 new_ids.add(ent_id)
             
-            entity_ids.append(ent_id)
+            if ent_id not in seen_ids:
+                seen_ids.add(ent_id)
+                entity_ids.append(ent_id)
+        
+        # New entities are name-indexed as they are created (so later entries in this
+        # batch resolve to them); only the embedding step is batched
+        embeddings = {}
+        if pending:
+            try:
+                vectors = await loop.run_in_executor(self.executor, self.ent_resolver.embed_entities, pending)
+            except Exception:
+                self.ent_resolver.drop_entities(ent_id for ent_id, _ in pending)
+                raise
+            embeddings = {ent_id: vector for (ent_id, _), vector in zip(pending, vectors)}
         
-        return entity_ids, new_ids, alias_ids
+        return entity_ids, new_ids, alias_ids, embeddings
 
     async def _extract_connections(
         self,
@@ -248,13 +262,15 @@ class BatchProcessor:
     ) -> Optional[ConnectionExtractionResponse]:
         """Extract connections between entities."""
         candidates = []
+        profiles = self.ent_resolver.entity_profiles
+        mentions_by_id = self.ent_resolver.get_mentions_for_ids(entity_ids)
         for ent_id in entity_ids:
-            profile = self.ent_resolver.entity_profiles.get(ent_id)
+            profile = profiles.get(ent_id)
             if profile:
                 candidates.append({
                     "name": profile["canonical_name"],
                     "type": profile["type"],
-                    "mentions": self.ent_resolver.get_mentions_for_id(ent_id)
+                    "mentions": mentions_by_id[ent_id]
                 })
         
         messages_text = "\n".join([f"{m['id']}: \"{m['message']}\"" for m in messages])
@@ -8,6 +8,7 @@ from fastapi.staticfiles import StaticFiles
 from loguru import logger
 from dotenv import load_dotenv
 
+from config import close_http_client
 from db.memgraph import MemGraphStore
 from main.context import Context
 from routes.middleware import SetupGuardMiddleware
@@ -49,6 +50,7 @@ async def lifespan(app: FastAPI):
     await context.shutdown()
     store.close()
     executor.shutdown(wait=True)
+    await close_http_client()
     logger.info("Shutdown complete")
 
 app = FastAPI(
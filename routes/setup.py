@@ -1,5 +1,5 @@
 import os
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from loguru import logger
@@ -71,6 +71,13 @@ async def create_user_entity(user_name: str, summary: Optional[str] = None) -> b
         return False
 
 
+def _invalidate_user_profile(http_request: Request, user_name: str):
+    """create_user_entity writes through its own driver; evict the running store's cached copy."""
+    store = getattr(http_request.app.state, "store", None)
+    if store is not None:
+        store.invalidate_profiles(names=[user_name], entity_ids=[1])
+
+
 class SetupStatusResponse(BaseModel):
     configured: bool
     user_name: Optional[str] = None
@@ -131,7 +138,7 @@ async def get_setup_status():
 
 
 @router.post("", response_model=SetupResponse)
-async def setup(request: SetupRequest):
+async def setup(request: SetupRequest, http_request: Request):
     if is_configured():
         raise HTTPException(
             status_code=400,
@@ -167,6 +174,8 @@ async def setup(request: SetupRequest):
     
     if not entity_created:
         logger.warning("Config saved but user entity creation failed. Will retry on app start.")
+    else:
+        _invalidate_user_profile(http_request, config["user_name"])
     
     logger.info(f"Setup complete for user: {config['user_name']}")
     
@@ -178,7 +187,7 @@ async def setup(request: SetupRequest):
 
 
 @router.patch("", response_model=SetupResponse)
-async def update_config(request: ConfigUpdateRequest):
+async def update_config(request: ConfigUpdateRequest, http_request: Request):
     if not is_configured():
         raise HTTPException(status_code=400, detail="Not configured yet. Use POST /setup first.")
     
@@ -192,10 +201,11 @@ async def update_config(request: ConfigUpdateRequest):
     
     if "user_summary" in updates:
         config = load_config()
-        await create_user_entity(
+        if await create_user_entity(
             user_name=config.get("user_name"),
             summary=updates["user_summary"]
-        )
+        ):
+            _invalidate_user_profile(http_request, config.get("user_name"))
     
     cred_fields = {"redis_password", "memgraph_user", "memgraph_password"}
     needs_restart = bool(cred_fields & set(updates.keys()))
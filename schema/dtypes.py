@@ -88,25 +88,25 @@ class ClarificationResult(BaseResult):
 
 RunResult = Union[CompleteResult, ClarificationResult]
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     name: str
     args: Dict = field(default_factory=dict)
 
 
-@dataclass 
+@dataclass(slots=True)
 class FinalResponse:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ClarificationRequest:
     question: str
 
 
 StellaResponse = Union[ToolCall, List[ToolCall], FinalResponse, ClarificationRequest]
 
-@dataclass
+@dataclass(slots=True)
 class TraceEntry:
     step: int
     state: str
@@ -118,7 +118,7 @@ class TraceEntry:
     duration_ms: float
     error: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class QueryTrace:
     trace_id: str
     user_query: str